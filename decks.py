@@ -0,0 +1,49 @@
+"""
+Shared slide builder for the project presentation scripts.
+Decks are described as data and rendered by a single loop.
+"""
+from pptx import Presentation
+
+# python-pptx default template layouts
+TITLE_LAYOUT = 0
+CONTENT_LAYOUT = 1
+
+
+def build_deck(slides, output_path):
+    """
+    Render a list of slide specs to a .pptx file.
+    
+    Each spec is a dict with:
+        title: Slide title
+        subtitle: Subtitle text (title-layout slides)
+        intro: Optional first line of the body (content-layout slides)
+        bullets: Body paragraphs (content-layout slides)
+        level: Optional indent level for bullets
+        layout: TITLE_LAYOUT if the slide has a subtitle, else CONTENT_LAYOUT
+    
+    Args:
+        slides: List of slide spec dicts
+        output_path: Where to save the presentation
+    """
+    prs = Presentation()
+    
+    for spec in slides:
+        layout = spec.get('layout', TITLE_LAYOUT if 'subtitle' in spec else CONTENT_LAYOUT)
+        slide = prs.slides.add_slide(prs.slide_layouts[layout])
+        slide.shapes.title.text = spec['title']
+        
+        if 'subtitle' in spec:
+            slide.placeholders[1].text = spec['subtitle']
+            continue
+        
+        tf = slide.placeholders[1].text_frame
+        if spec.get('intro') is not None:
+            tf.text = spec['intro']
+        
+        for bullet in spec.get('bullets', []):
+            p = tf.add_paragraph()
+            p.text = bullet
+            if 'level' in spec:
+                p.level = spec['level']
+    
+    prs.save(output_path)
@@ -1,20 +1,47 @@
 """
 Command-line interface for address lookup.
 """
+import os
 import sys
 import argparse
 import csv
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.lookup_service import get_lookup_service
 from src import config
 
+# Maximum number of lookups kept in flight during batch processing
+DEFAULT_BATCH_CONCURRENCY = 32
+
+# Flush Sheets writes and checkpoint output every N rows so a crash keeps finished work
+BATCH_FLUSH_EVERY = 100
+
+# Columns appended to each input row in batch output
+BATCH_OUTPUT_COLUMNS = [
+    'normalized_company',
+    'street_1',
+    'street_2',
+    'city',
+    'state_region',
+    'postal_code',
+    'country',
+    'lat',
+    'lng',
+    'confidence',
+    'qa_status',
+    'source',
+    'error',
+]
+
 
 def interactive_lookup():
     """Interactive lookup mode."""
+    from src.lookup_service import get_lookup_service
+    
     print("=" * 60)
     print("Address Geocoding System - Interactive Mode")
     print("=" * 60)
@@ -69,6 +96,8 @@ def interactive_lookup():
 
 def single_lookup(company: str, site_hint: str = None):
     """Single lookup command."""
+    from src.lookup_service import get_lookup_service
+    
     service = get_lookup_service()
     
     print(f"Looking up: {company}", end="")
@@ -88,80 +117,210 @@ def single_lookup(company: str, site_hint: str = None):
         sys.exit(1)
 
 
-def batch_lookup(input_file: str, output_file: str):
+def _lookup_row(service, row: dict, index=None):
+    """Run a single batch lookup, returning (record, source) or raising."""
+    company = row.get('company', '').strip()
+    site_hint = row.get('site_hint', '').strip()
+    return service.lookup(company, site_hint or None, index=index, defer_write=True)
+
+
+def _write_result(writer, i: int, row: dict, future):
+    """Wait for a batch lookup and write its output row."""
+    company = row.get('company', '').strip()
+    
+    try:
+        record, source = future.result()
+    except Exception as e:
+        print(f"  {i}: {company} ... ✗ Error: {e}")
+        writer.writerow({
+            **row,
+            'error': str(e),
+            'source': 'error',
+        })
+        return
+    
+    if record:
+        print(f"  {i}: {company} ... ✓ ({source})")
+        writer.writerow({
+            **row,  # Include original columns
+            'normalized_company': record.get('company_normalized'),
+            'street_1': record.get('street_1'),
+            'street_2': record.get('street_2'),
+            'city': record.get('city'),
+            'state_region': record.get('state_region'),
+            'postal_code': record.get('postal_code'),
+            'country': record.get('country'),
+            'lat': record.get('lat'),
+            'lng': record.get('lng'),
+            'confidence': record.get('confidence'),
+            'qa_status': record.get('qa_status'),
+            'source': source,
+        })
+    else:
+        print(f"  {i}: {company} ... ✗ Not found")
+        writer.writerow({
+            **row,
+            'error': 'not_found',
+            'source': source,
+        })
+
+
+def _load_checkpoint(checkpoint_path: Path, output_path: Path) -> set:
+    """
+    Read row numbers completed by a previous batch run.
+    
+    Each checkpoint line is "<row number>\t<output length>". Output past the
+    last checkpointed length (rows written but never recorded) is cut off,
+    so resuming doesn't write those rows twice.
+    """
+    if not checkpoint_path.exists():
+        return set()
+    
+    with open(checkpoint_path, 'rb') as f:
+        data = f.read()
+    
+    # Drop a line torn by the interrupt so appended lines stay well-formed
+    complete = data[:data.rfind(b'\n') + 1]
+    if len(complete) < len(data):
+        with open(checkpoint_path, 'r+b') as f:
+            f.truncate(len(complete))
+    
+    done = set()
+    offset = None
+    for line in complete.decode('utf-8').splitlines():
+        try:
+            row_number, length = map(int, line.split('\t'))
+        except ValueError:
+            continue
+        done.add(row_number)
+        offset = length
+    
+    if offset is not None and output_path.stat().st_size > offset:
+        with open(output_path, 'r+b') as f:
+            f.truncate(offset)
+    
+    # Row 0 marks the header
+    done.discard(0)
+    return done
+
+
+def _save_checkpoint(fout, checkpoint, rows: list):
+    """Make written output durable, then record its rows as done and clear them."""
+    _sync(fout)
+    checkpoint.write(''.join(f"{row_number}\t{length}\n" for row_number, length in rows))
+    _sync(checkpoint)
+    rows.clear()
+
+
+def _sync(*files):
+    """Flush files and make them durable on disk, in the order given."""
+    for f in files:
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def batch_lookup(input_file: str, output_file: str, concurrency: int = None, resume: bool = False):
     """Batch lookup from CSV file."""
+    from src.lookup_service import get_lookup_service
+    
     print(f"Batch processing: {input_file} → {output_file}")
     
     if not Path(input_file).exists():
         print(f"✗ Input file not found: {input_file}")
         sys.exit(1)
     
+    # Rows already written by an interrupted run are skipped on --resume
+    checkpoint_path = Path(f"{output_file}.done")
+    resuming = resume and Path(output_file).exists() and Path(output_file).stat().st_size > 0
+    done = _load_checkpoint(checkpoint_path, Path(output_file)) if resuming else set()
+    
+    if resuming:
+        print(f"Resuming: {len(done)} rows already completed")
+    
     service = get_lookup_service()
     
-    # Read input CSV
-    with open(input_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
+    # Fetch the registry once instead of hitting Sheets for every row
+    index = service.build_index()
+    print(f"Loaded {len(index)} registry records")
     
-    if not rows:
-        print("✗ No data in input file")
-        sys.exit(1)
+    # Lookups are network-bound, so keep several in flight at once
+    concurrency = concurrency or DEFAULT_BATCH_CONCURRENCY
     
-    # Process each row
-    results = []
-    for i, row in enumerate(rows, 1):
-        company = row.get('company', '').strip()
-        site_hint = row.get('site_hint', '').strip()
-        
-        if not company:
-            print(f"  {i}/{len(rows)}: Skipping (empty company)")
-            continue
+    processed = 0
+    mode = 'a' if resuming else 'w'
+    
+    # Stream rows through: results are written in input order as soon as
+    # they are ready, so memory stays flat regardless of file size
+    with open(input_file, 'r', encoding='utf-8', newline='') as fin, \
+            open(output_file, mode, encoding='utf-8', newline='') as fout, \
+            open(checkpoint_path, mode, encoding='utf-8') as checkpoint, \
+            ThreadPoolExecutor(max_workers=concurrency) as executor:
+        reader = csv.DictReader(fin)
+        input_columns = reader.fieldnames or []
+        fieldnames = input_columns + [c for c in BATCH_OUTPUT_COLUMNS if c not in input_columns]
         
-        print(f"  {i}/{len(rows)}: {company}", end=" ... ")
+        writer = csv.DictWriter(fout, fieldnames=fieldnames, restval='')
+        if not resuming:
+            writer.writeheader()
+            _save_checkpoint(fout, checkpoint, [(0, fout.tell())])
         
-        record, source = service.lookup(company, site_hint or None)
+        # In-flight lookups in input order; at most `concurrency` deep
+        pending = deque()
+        # Rows written since the last checkpoint, as (input row number, output
+        # length); row numbers keep repeated company/site rows distinct
+        completed = []
+        written = 0
         
-        if record:
-            print(f"✓ ({source})")
-            results.append({
-                **row,  # Include original columns
-                'normalized_company': record.get('company_normalized'),
-                'street_1': record.get('street_1'),
-                'street_2': record.get('street_2'),
-                'city': record.get('city'),
-                'state_region': record.get('state_region'),
-                'postal_code': record.get('postal_code'),
-                'country': record.get('country'),
-                'lat': record.get('lat'),
-                'lng': record.get('lng'),
-                'confidence': record.get('confidence'),
-                'qa_status': record.get('qa_status'),
-                'source': source,
-            })
-        else:
-            print(f"✗ Not found")
-            results.append({
-                **row,
-                'error': 'not_found',
-                'source': source,
-            })
-    
-    # Write output CSV
-    if results:
-        fieldnames = list(results[0].keys())
+        def commit():
+            # Rows only count as done once their registry records are in
+            # Sheets; otherwise a hard kill would leave them marked done but
+            # unsaved, and --resume would skip them
+            if service.flush_pending():
+                _save_checkpoint(fout, checkpoint, completed)
         
-        with open(output_file, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(results)
+        def drain(limit: int):
+            nonlocal written
+            while len(pending) > limit:
+                i, row, future = pending.popleft()
+                _write_result(writer, i, row, future)
+                completed.append((i, fout.tell()))
+                written += 1
+                
+                if written % BATCH_FLUSH_EVERY == 0:
+                    commit()
         
+        # Write queued registry records even if the batch is interrupted,
+        # once lookups still running have finished and queued ones are dropped
+        try:
+            for i, row in enumerate(reader, 1):
+                if not row.get('company', '').strip():
+                    print(f"  {i}: Skipping (empty company)")
+                    continue
+                
+                processed += 1
+                
+                if i in done:
+                    continue
+                
+                pending.append((i, row, executor.submit(_lookup_row, service, row, index)))
+                drain(concurrency - 1)
+            
+            drain(0)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            commit()
+    
+    if processed:
         print(f"\n✓ Results saved to: {output_file}")
     else:
-        print("\n✗ No results to save")
+        print("\n✗ No data in input file")
+        sys.exit(1)
 
 
 def show_stats():
     """Show system statistics."""
+    from src.lookup_service import get_lookup_service
+    
     service = get_lookup_service()
     stats = service.get_stats()
     
@@ -180,6 +339,8 @@ def show_stats():
 
 def show_review_queue():
     """Show records needing review."""
+    from src.lookup_service import get_lookup_service
+    
     service = get_lookup_service()
     queue = service.get_review_queue()
     
@@ -213,6 +374,9 @@ Examples:
   # Batch processing
   python cli.py batch --input companies.csv --output results.csv
   
+  # Resume an interrupted batch
+  python cli.py batch --input companies.csv --output results.csv --resume
+  
   # Show statistics
   python cli.py stats
   
@@ -221,6 +385,11 @@ Examples:
         """
     )
     
+    parser.add_argument(
+        '--cache-path',
+        help=f'SQLite cache file, reused across runs (default: {config.CACHE_DB_PATH})'
+    )
+    
     subparsers = parser.add_subparsers(dest='command', help='Command to run')
     
     # Lookup command
@@ -232,6 +401,14 @@ Examples:
     batch_parser = subparsers.add_parser('batch', help='Batch process CSV file')
     batch_parser.add_argument('--input', '-i', required=True, help='Input CSV file')
     batch_parser.add_argument('--output', '-o', required=True, help='Output CSV file')
+    batch_parser.add_argument(
+        '--concurrency', '-c', type=int, default=None,
+        help=f'Number of concurrent lookups (default: {DEFAULT_BATCH_CONCURRENCY})'
+    )
+    batch_parser.add_argument(
+        '--resume', action='store_true',
+        help='Skip rows completed by a previous interrupted run of the same output'
+    )
     
     # Stats command
     subparsers.add_parser('stats', help='Show system statistics')
@@ -250,6 +427,10 @@ Examples:
         print("\nPlease check your .env file and service_account.json")
         sys.exit(1)
     
+    # Cache is created lazily by the lookup service, so override before routing
+    if args.cache_path:
+        config.CACHE_DB_PATH = args.cache_path
+    
     # Route to appropriate function
     if args.command == 'lookup':
         if args.company:
@@ -258,7 +439,7 @@ Examples:
             interactive_lookup()
     
     elif args.command == 'batch':
-        batch_lookup(args.input, args.output)
+        batch_lookup(args.input, args.output, args.concurrency, args.resume)
     
     elif args.command == 'stats':
         show_stats()
@@ -1,12 +1,21 @@
 # Source module
+import importlib
+
 from .config import *
-from .normalize import normalize_company, load_golden_mappings
-from .geocode import GeocodingService, extract_country_hint
-from .matching import find_best_match, calculate_similarity
+from .normalize import normalize_company, normalize_company_batch, load_golden_mappings
 from .validators import validate_address_record, suggest_manual_review
 
+# Names backed by heavy API/client libraries, imported on first access
+_LAZY_IMPORTS = {
+    'GeocodingService': '.geocode',
+    'extract_country_hint': '.geocode',
+    'find_best_match': '.matching',
+    'calculate_similarity': '.matching',
+}
+
 __all__ = [
     'normalize_company',
+    'normalize_company_batch',
     'load_golden_mappings',
     'GeocodingService',
     'extract_country_hint',
@@ -15,3 +24,10 @@ __all__ = [
     'validate_address_record',
     'suggest_manual_review',
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
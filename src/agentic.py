@@ -3,14 +3,22 @@ Fully Agentic Mode - AI Verification Engine.
 Uses Google's Gemini to verify address accuracy via web search.
 """
 import os
-import requests
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 import google.generativeai as genai
 from typing import Dict, Optional, Tuple, List
 import json
 import re
+from urllib.parse import quote_plus
 
 from . import config
+from .http_pool import api_retry, create_session
+
+# Outermost {...} block in a model reply (replies may wrap JSON in prose or fences)
+_JSON_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# Shared across verifier instances (one is created per lookup) to keep connections warm
+_SESSION = create_session(pool_size=8, retries=api_retry(total=2, backoff_factor=0.3))
+_SESSION.headers.update({'User-Agent': 'Mozilla/5.0', 'Accept-Encoding': 'gzip, deflate'})
 
 class AgenticVerifier:
     """Uses LLM to verify addresses found by geocoder."""
@@ -74,11 +82,8 @@ class AgenticVerifier:
         """
         
         try:
-            response = self.model.generate_content(prompt)
-            # Find JSON in response
-            json_match = re.search(r'\{.*\}', response.text, re.DOTALL)
-            if json_match:
-                result = json.loads(json_match.group())
+            result = self._parse_json(self._stream_reply(prompt))
+            if result is not None:
                 return {
                     "status": "verified" if result.get("confidence", 0) > 0.7 else "uncertain",
                     "message": result.get("explanation", ""),
@@ -106,24 +111,92 @@ class AgenticVerifier:
         # This is a simplified search logic as we don't have a dedicated Search API key requirement yet.
         # We'll use a search URL and extract snippets.
         try:
-            url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
-            headers = {'User-Agent': 'Mozilla/5.0'}
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            url = f"https://www.google.com/search?q={quote_plus(query)}"
+            response = _SESSION.get(url, timeout=(3, 10))
+            tree = LexborHTMLParser(response.text)
             
             results = []
-            for g in soup.find_all('div', class_='g'):
-                anchors = g.find_all('a')
-                if anchors:
-                    link = anchors[0]['href']
-                    title = g.find('h3').text if g.find('h3') else ""
-                    snippet = g.find('div', class_='VwiC3b').text if g.find('div', class_='VwiC3b') else ""
-                    results.append({"title": title, "link": link, "snippet": snippet})
+            for g in tree.css('div.g'):
+                link = g.css_first('a')
+                if link is None:
+                    continue
+                title = g.css_first('h3')
+                snippet = g.css_first('div.VwiC3b')
+                results.append({
+                    "title": title.text() if title else "",
+                    "link": link.attributes.get('href') or "",
+                    "snippet": snippet.text() if snippet else ""
+                })
+                if len(results) == 3:
+                    break
             
             return results[:3] # Top 3
         except:
             return []
 
+    def _stream_reply(self, prompt: str) -> str:
+        """
+        Stream a model reply, stopping once the first JSON object is complete.
+        
+        Args:
+            prompt: Prompt text
+        
+        Returns:
+            Reply text up to the end of the first JSON object (or the full reply)
+        """
+        text = ""
+        depth = 0
+        in_string = escaped = False
+        
+        for chunk in self.model.generate_content(prompt, stream=True):
+            start = len(text)
+            text += chunk.text
+            
+            # Track brace depth, ignoring braces inside JSON strings
+            for i in range(start, len(text)):
+                ch = text[i]
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif ch == '\\':
+                        escaped = True
+                    elif ch == '"':
+                        in_string = False
+                elif ch == '"' and depth:
+                    in_string = True
+                elif ch == '{':
+                    depth += 1
+                elif ch == '}' and depth:
+                    depth -= 1
+                    if not depth:
+                        # Leaving the loop stops the rest of the generation
+                        return text[:i + 1]
+        
+        return text
+
+    def _parse_json(self, text: str) -> Optional[Dict]:
+        """
+        Extract the JSON object from a model reply.
+        
+        Args:
+            text: Raw reply text
+        
+        Returns:
+            Parsed object, or None if the reply has no JSON object
+        """
+        # Replies are usually bare JSON, so try that before scanning
+        try:
+            result = json.loads(text.strip())
+            if isinstance(result, dict):
+                return result
+        except ValueError:
+            pass
+        
+        json_match = _JSON_RE.search(text)
+        if json_match:
+            return json.loads(json_match.group())
+        return None
+
     def _extract_context(self, results: List[Dict]) -> str:
         """Convert results list to a string context."""
         context = ""
@@ -43,10 +43,12 @@ except (PermissionError, OSError):
 
 CACHE_TTL_HOURS = int(os.getenv("CACHE_TTL_HOURS", "24"))
 MAX_CACHE_SIZE = int(os.getenv("MAX_CACHE_SIZE", "10000"))
+REGISTRY_CACHE_SECONDS = int(os.getenv("REGISTRY_CACHE_SECONDS", "300"))
 
 # Rate Limiting
 MAX_API_CALLS_PER_DAY = int(os.getenv("MAX_API_CALLS_PER_DAY", "1000"))
 WARNING_THRESHOLD = int(os.getenv("WARNING_THRESHOLD", "800"))
+MAX_API_CALLS_PER_SECOND = int(os.getenv("MAX_API_CALLS_PER_SECOND", "40"))
 
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -55,6 +57,21 @@ LOG_FILE = os.getenv("LOG_FILE", "geocoding.log")
 # Data Files
 GOLDEN_MAPPINGS_FILE = PROJECT_ROOT / "data" / "golden_mappings.json"
 
+def refresh_from_env():
+    """
+    Re-read credential settings from the environment.
+    
+    The Streamlit app sets these in os.environ at runtime; refreshing them
+    in place is much cheaper than reloading the whole module.
+    """
+    global GOOGLE_MAPS_API_KEY, GOOGLE_AI_API_KEY, GOOGLE_SHEETS_ID, WORKSHEET_NAME, SERVICE_ACCOUNT_FILE
+    
+    GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY", "")
+    GOOGLE_AI_API_KEY = os.getenv("GOOGLE_AI_API_KEY", "")
+    GOOGLE_SHEETS_ID = os.getenv("GOOGLE_SHEETS_ID", "")
+    WORKSHEET_NAME = os.getenv("WORKSHEET_NAME", "address_registry")
+    SERVICE_ACCOUNT_FILE = os.getenv("SERVICE_ACCOUNT_FILE", "service_account.json")
+
 # Validation
 def validate_config():
     """Validate that required configuration is present."""
@@ -3,11 +3,67 @@ Geocoding service integration module.
 Handles interaction with geocoding APIs (Google Maps, OSM, etc.)
 """
 import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from functools import lru_cache
 from typing import Optional, Dict, List, Tuple
 import googlemaps
 from datetime import datetime
 
 from . import config
+from .http_pool import create_session
+from .ratelimit import TokenBucket, call_with_backoff
+
+# HTTP statuses worth retrying after backing off
+RETRYABLE_STATUSES = (429, 503)
+
+# Recent geocode responses kept in-process per service
+MEMO_SIZE = 1024
+
+# Result types that indicate a specific vs. area-level match
+_PREFERRED_TYPES = frozenset({'street_address', 'premise', 'establishment', 'point_of_interest'})
+_GENERIC_TYPES = frozenset({'locality', 'administrative_area_level_1', 'country'})
+
+# Address component type -> (priority, field, only if no city yet)
+_COMPONENT_FIELDS = {
+    'street_number': (0, 'street_number', False),
+    'route': (1, 'route', False),
+    'subpremise': (2, 'subpremise', False),
+    'premise': (3, 'premise', False),
+    'locality': (4, 'city', False),
+    'postal_town': (5, 'city', True),
+    'administrative_area_level_2': (6, 'city', True),
+    'administrative_area_level_1': (7, 'state_region', False),
+    'country': (8, 'country', False),
+    'postal_code': (9, 'postal_code', False),
+}
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Retry throttling responses and connection failures, not other HTTP errors."""
+    if isinstance(error, googlemaps.exceptions.HTTPError):
+        return error.status_code in RETRYABLE_STATUSES
+    return True
+
+
+@dataclass(slots=True)
+class ParsedGeocode:
+    """Standardized address components from a single geocoding result."""
+    street_1: str = ''
+    street_2: str = ''
+    city: str = ''
+    state_region: str = ''
+    postal_code: str = ''
+    country: str = ''  # ISO-2 code
+    country_long: str = ''
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+    formatted_address: str = ''
+    place_id: str = ''
+    confidence: float = 0.0
+    result_types: tuple = ()
 
 
 class GeocodingService:
@@ -24,7 +80,15 @@ class GeocodingService:
         if not self.api_key:
             raise ValueError("Google Maps API key not configured")
         
-        self.client = googlemaps.Client(key=self.api_key)
+        # One pooled session so concurrent lookups reuse warm connections;
+        # the googlemaps client handles its own retries
+        self.session = create_session()
+        self.client = googlemaps.Client(key=self.api_key, requests_session=self.session)
+        # Shared across threads so concurrent lookups stay under the QPS quota
+        self.limiter = TokenBucket(config.MAX_API_CALLS_PER_SECOND)
+        self._memo = OrderedDict()
+        self._memo_lock = threading.Lock()
+        self._track_lock = threading.Lock()
         self.call_count = 0
         self.last_call_time = None
     
@@ -56,13 +120,22 @@ class GeocodingService:
             # Use components filter for country bias
             params['components'] = {'country': country_hint}
         
+        # Repeat queries are answered from the memo without an API call
+        key = (company.strip().casefold(), (site_hint or '').casefold(), country_hint or '')
+        with self._memo_lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key]
+        
         try:
             # Make API call
             self._track_api_call()
-            results = self.client.geocode(query, **params)
+            results = self._call_api(self.client.geocode, query, **params) or None
             
-            if not results:
-                return None
+            with self._memo_lock:
+                self._memo[key] = results
+                if len(self._memo) > MEMO_SIZE:
+                    self._memo.popitem(last=False)
             
             return results
         
@@ -73,7 +146,25 @@ class GeocodingService:
             print(f"Unexpected error during geocoding: {e}")
             return None
     
-    def parse_geocode_result(self, result: Dict) -> Dict:
+    def geocode_many(
+        self,
+        items: List[Tuple[str, Optional[str], Optional[str]]],
+        max_workers: int = 8
+    ) -> List[Optional[List[Dict]]]:
+        """
+        Geocode several companies concurrently.
+        
+        Args:
+            items: (company, site_hint, country_hint) tuples
+            max_workers: Maximum concurrent API requests
+        
+        Returns:
+            Results for each item, in input order (None where nothing was found)
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda item: self.geocode_company(*item), items))
+    
+    def parse_geocode_result(self, result: Dict) -> ParsedGeocode:
         """
         Parse geocoding result into standardized address components.
         
@@ -81,7 +172,7 @@ class GeocodingService:
             result: Raw geocoding result from API
         
         Returns:
-            Dict with parsed address components
+            ParsedGeocode with parsed address components
         """
         # Extract address components
         components = {}
@@ -90,28 +181,16 @@ class GeocodingService:
             long_name = component.get('long_name', '')
             short_name = component.get('short_name', '')
             
-            # Map component types to our fields
-            if 'street_number' in types:
-                components['street_number'] = long_name
-            elif 'route' in types:
-                components['route'] = long_name
-            elif 'subpremise' in types:
-                components['subpremise'] = long_name
-            elif 'premise' in types:
-                components['premise'] = long_name
-            elif 'locality' in types:
-                components['city'] = long_name
-            elif 'postal_town' in types and 'city' not in components:
-                components['city'] = long_name
-            elif 'administrative_area_level_2' in types and 'city' not in components:
-                components['city'] = long_name
-            elif 'administrative_area_level_1' in types:
-                components['state_region'] = long_name
-            elif 'country' in types:
-                components['country'] = short_name  # ISO-2 code
-                components['country_long'] = long_name
-            elif 'postal_code' in types:
-                components['postal_code'] = long_name
+            # Highest-priority mapped type wins; fallbacks only fill an empty city
+            for _, field, fallback in sorted(_COMPONENT_FIELDS[t] for t in types if t in _COMPONENT_FIELDS):
+                if fallback and 'city' in components:
+                    continue
+                if field == 'country':
+                    components['country'] = short_name  # ISO-2 code
+                    components['country_long'] = long_name
+                else:
+                    components[field] = long_name
+                break
         
         # Build street address
         street_parts = []
@@ -132,21 +211,21 @@ class GeocodingService:
         # Calculate confidence
         confidence = self._calculate_confidence(result)
         
-        return {
-            'street_1': street_1,
-            'street_2': street_2,
-            'city': components.get('city', ''),
-            'state_region': components.get('state_region', ''),
-            'postal_code': components.get('postal_code', ''),
-            'country': components.get('country', ''),
-            'country_long': components.get('country_long', ''),
-            'lat': location.get('lat'),
-            'lng': location.get('lng'),
-            'formatted_address': result.get('formatted_address', ''),
-            'place_id': result.get('place_id', ''),
-            'confidence': confidence,
-            'result_types': result.get('types', []),
-        }
+        return ParsedGeocode(
+            street_1=street_1,
+            street_2=street_2,
+            city=components.get('city', ''),
+            state_region=components.get('state_region', ''),
+            postal_code=components.get('postal_code', ''),
+            country=components.get('country', ''),
+            country_long=components.get('country_long', ''),
+            lat=location.get('lat'),
+            lng=location.get('lng'),
+            formatted_address=result.get('formatted_address', ''),
+            place_id=result.get('place_id', ''),
+            confidence=confidence,
+            result_types=tuple(result.get('types', ())),
+        )
     
     def _calculate_confidence(self, result: Dict) -> float:
         """
@@ -165,12 +244,9 @@ class GeocodingService:
             confidence -= 0.20
         
         # Prefer specific result types
-        result_types = result.get('types', [])
-        preferred_types = ['street_address', 'premise', 'establishment', 'point_of_interest']
-        generic_types = ['locality', 'administrative_area_level_1', 'country']
-        
-        has_preferred = any(t in result_types for t in preferred_types)
-        has_generic = any(t in result_types for t in generic_types)
+        result_types = result.get('types', ())
+        has_preferred = not _PREFERRED_TYPES.isdisjoint(result_types)
+        has_generic = not _GENERIC_TYPES.isdisjoint(result_types)
         
         if not has_preferred and has_generic:
             confidence -= 0.25
@@ -188,18 +264,40 @@ class GeocodingService:
     
     def _track_api_call(self):
         """Track API call for rate limiting."""
-        self.call_count += 1
-        self.last_call_time = datetime.now()
+        with self._track_lock:
+            self.call_count += 1
+            self.last_call_time = datetime.now()
+            count = self.call_count
         
         # Warn if approaching limits
-        if self.call_count >= config.WARNING_THRESHOLD:
-            print(f"⚠️  Warning: {self.call_count} API calls made today (limit: {config.MAX_API_CALLS_PER_DAY})")
+        if count >= config.WARNING_THRESHOLD:
+            print(f"⚠️  Warning: {count} API calls made today (limit: {config.MAX_API_CALLS_PER_DAY})")
         
         # Enforce hard limit
-        if self.call_count >= config.MAX_API_CALLS_PER_DAY:
+        if count >= config.MAX_API_CALLS_PER_DAY:
             raise Exception(f"Daily API call limit reached ({config.MAX_API_CALLS_PER_DAY})")
     
-    def reverse_geocode(self, lat: float, lng: float) -> Optional[Dict]:
+    def _call_api(self, method, *args, **kwargs):
+        """
+        Make a rate-limited API call, backing off on throttling.
+        
+        Args:
+            method: Bound googlemaps client method
+        
+        Returns:
+            API response
+        """
+        def attempt():
+            self.limiter.acquire()
+            return method(*args, **kwargs)
+        
+        return call_with_backoff(
+            attempt,
+            retry_on=(googlemaps.exceptions.TransportError,),
+            should_retry=_is_retryable,
+        )
+    
+    def reverse_geocode(self, lat: float, lng: float) -> Optional[ParsedGeocode]:
         """
         Reverse geocode coordinates to address (for validation).
         
@@ -212,7 +310,7 @@ class GeocodingService:
         """
         try:
             self._track_api_call()
-            results = self.client.reverse_geocode((lat, lng))
+            results = self._call_api(self.client.reverse_geocode, (lat, lng))
             
             if results:
                 return self.parse_geocode_result(results[0])
@@ -223,6 +321,31 @@ class GeocodingService:
             return None
 
 
+# Common country names/codes in site hints, mapped to ISO-2 codes
+_COUNTRY_MAP = {
+    'INDIA': 'IN',
+    'IN': 'IN',
+    'USA': 'US',
+    'US': 'US',
+    'UNITED STATES': 'US',
+    'UK': 'GB',
+    'UNITED KINGDOM': 'GB',
+    'CANADA': 'CA',
+    'CA': 'CA',
+    'AUSTRALIA': 'AU',
+    'AU': 'AU',
+    'GERMANY': 'DE',
+    'DE': 'DE',
+    'FRANCE': 'FR',
+    'FR': 'FR',
+    'JAPAN': 'JP',
+    'JP': 'JP',
+    'CHINA': 'CN',
+    'CN': 'CN',
+}
+
+
+@lru_cache(maxsize=2048)
 def extract_country_hint(site_hint: str) -> Optional[str]:
     """
     Extract country code from site hint.
@@ -236,36 +359,9 @@ def extract_country_hint(site_hint: str) -> Optional[str]:
     if not site_hint:
         return None
     
-    # Common country mappings
-    country_map = {
-        'INDIA': 'IN',
-        'IN': 'IN',
-        'USA': 'US',
-        'US': 'US',
-        'UNITED STATES': 'US',
-        'UK': 'GB',
-        'UNITED KINGDOM': 'GB',
-        'CANADA': 'CA',
-        'CA': 'CA',
-        'AUSTRALIA': 'AU',
-        'AU': 'AU',
-        'GERMANY': 'DE',
-        'DE': 'DE',
-        'FRANCE': 'FR',
-        'FR': 'FR',
-        'JAPAN': 'JP',
-        'JP': 'JP',
-        'CHINA': 'CN',
-        'CN': 'CN',
-    }
-    
     # Check last part of hint (usually country)
-    parts = [p.strip().upper() for p in site_hint.split(',')]
-    if parts:
-        last_part = parts[-1]
-        return country_map.get(last_part)
-    
-    return None
+    last_part = site_hint.rsplit(',', 1)[-1].strip().upper()
+    return _COUNTRY_MAP.get(last_part)
 
 
 if __name__ == "__main__":
@@ -284,7 +380,7 @@ if __name__ == "__main__":
             print(f"Found {len(results)} results")
             parsed = service.parse_geocode_result(results[0])
             print("\nParsed result:")
-            for key, value in parsed.items():
+            for key, value in asdict(parsed).items():
                 print(f"  {key}: {value}")
         else:
             print("No results found")
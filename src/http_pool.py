@@ -0,0 +1,63 @@
+"""
+Shared HTTP connection pooling for outbound API clients.
+Reusing warm TCP/TLS connections avoids a handshake on every request.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Connections kept open per host; matches the CLI's batch concurrency
+POOL_SIZE = 32
+
+
+def api_retry(total: int = 3, backoff_factor: float = 0.2) -> Retry:
+    """
+    Retry policy for transient API failures.
+    
+    Args:
+        total: Maximum number of retries
+        backoff_factor: Base delay for exponential backoff (seconds)
+    
+    Returns:
+        urllib3 Retry configuration
+    """
+    return Retry(
+        total=total,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+    )
+
+
+def mount_pool(session: requests.Session, pool_size: int = POOL_SIZE, retries: Retry = None) -> requests.Session:
+    """
+    Mount a pooled HTTPS adapter on an existing session.
+    
+    Args:
+        session: Session to configure (e.g. a google-auth AuthorizedSession)
+        pool_size: Maximum connections kept per host
+        retries: Optional retry policy (no retries if not provided)
+    
+    Returns:
+        The same session, for chaining
+    """
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retries or 0,
+    )
+    session.mount('https://', adapter)
+    return session
+
+
+def create_session(pool_size: int = POOL_SIZE, retries: Retry = None) -> requests.Session:
+    """
+    Create a new pooled requests session.
+    
+    Args:
+        pool_size: Maximum connections kept per host
+        retries: Optional retry policy
+    
+    Returns:
+        Configured requests session
+    """
+    return mount_pool(requests.Session(), pool_size, retries)
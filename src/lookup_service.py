@@ -1,13 +1,16 @@
 """
 Main lookup service - orchestrates all components.
 """
-from typing import Optional, Dict, Tuple
-from datetime import datetime
+import threading
+from concurrent.futures import Future
+from typing import Optional, Dict, List, Tuple
+from datetime import datetime, timezone
+from urllib.parse import quote_plus
 
 from src import config
 from src.normalize import normalize_company
-from src.geocode import GeocodingService, extract_country_hint
-from src.storage import get_cache, SheetsStorage
+from src.geocode import extract_country_hint
+from src.storage import get_cache, RegistryIndex
 from src.matching import find_best_match
 from src.validators import validate_address_record, suggest_manual_review
 
@@ -20,23 +23,41 @@ class AddressLookupService:
         self.geocoder = None
         self.storage = None
         self.cache = get_cache()
+        self.confidence_threshold = config.CONFIDENCE_THRESHOLD
+        # Guards lazy initialization when lookups run on worker threads
+        self._init_lock = threading.Lock()
+        # Geocoded records waiting to be written by flush_pending(), by cache key
+        self._pending: Dict[tuple, Dict] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # Lookups currently running, by cache key, so duplicates wait for them
+        self._inflight: Dict[tuple, Future] = {}
+        self._inflight_lock = threading.Lock()
     
     def _init_geocoder(self):
         """Lazy initialize geocoder."""
         if self.geocoder is None:
-            self.geocoder = GeocodingService()
+            from src.geocode import GeocodingService
+            with self._init_lock:
+                if self.geocoder is None:
+                    self.geocoder = GeocodingService()
     
     def _init_storage(self):
         """Lazy initialize storage."""
         if self.storage is None:
-            self.storage = SheetsStorage()
+            from src.storage.sheets_io import SheetsStorage
+            with self._init_lock:
+                if self.storage is None:
+                    self.storage = SheetsStorage()
     
     def lookup(
         self,
         company: str,
         site_hint: str = None,
         agentic_verify: bool = False,
-        ai_api_key: str = None
+        ai_api_key: str = None,
+        index: RegistryIndex = None,
+        defer_write: bool = False
     ) -> Tuple[Optional[Dict], str]:
         """
         Look up company address with automatic caching and geocoding.
@@ -46,6 +67,10 @@ class AddressLookupService:
             site_hint: Optional location hint (e.g., "Pune, India")
             agentic_verify: Whether to use AI for secondary verification
             ai_api_key: Optional Gemini API key if not in config
+            index: Optional prefetched registry index (see build_index);
+                when given, storage matches are served from it instead of Sheets
+            defer_write: Queue new records for flush_pending() instead of
+                writing each one to Sheets immediately
         
         Returns:
             Tuple of (address_record, source)
@@ -61,6 +86,47 @@ class AddressLookupService:
         if site_hint and ',' in site_hint:
             city_hint = site_hint.split(',')[0].strip()
         
+        # Identical lookups already in flight wait for that one's result
+        # instead of each geocoding and queueing its own registry row
+        key = (company_normalized, city_hint, country_hint)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        
+        if not owner:
+            return future.result()
+        
+        try:
+            result = self._resolve(
+                company, site_hint, company_normalized, city_hint, country_hint,
+                agentic_verify, ai_api_key, index, defer_write
+            )
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+        
+        return result
+    
+    def _resolve(
+        self,
+        company: str,
+        site_hint: Optional[str],
+        company_normalized: str,
+        city_hint: Optional[str],
+        country_hint: Optional[str],
+        agentic_verify: bool,
+        ai_api_key: Optional[str],
+        index: Optional[RegistryIndex],
+        defer_write: bool
+    ) -> Tuple[Optional[Dict], str]:
+        """Run the cache → storage → geocode chain for one normalized lookup."""
         # 1. Check cache first
         cached = self.cache.get(
             company_normalized,
@@ -71,10 +137,18 @@ class AddressLookupService:
             print(f"✓ Cache hit for {company_normalized}")
             return cached, 'cache'
         
-        # 2. Check storage (Google Sheets)
+        # Geocoded earlier in this batch but not written to Sheets yet
+        with self._pending_lock:
+            queued = self._pending.get((company_normalized, city_hint, country_hint))
+        if queued:
+            print(f"✓ Pending hit for {company_normalized}")
+            return queued, 'cache'
+        
+        # 2. Check storage (Google Sheets, or its prefetched index)
         self._init_storage()
+        registry = index if index is not None else self.storage
         
-        stored = self.storage.find_by_exact_match(
+        stored = registry.find_by_exact_match(
             company_normalized,
             city=city_hint,
             country=country_hint
@@ -86,7 +160,7 @@ class AddressLookupService:
             return stored, 'storage'
         
         # Try fuzzy match
-        fuzzy_results = self.storage.search_fuzzy(
+        fuzzy_results = registry.search_fuzzy(
             company_normalized,
             country=country_hint
         )
@@ -122,9 +196,9 @@ class AddressLookupService:
         parsed = self.geocoder.parse_geocode_result(results[0])
         
         # Generate links
-        maps_link = f"https://www.google.com/maps/search/?api=1&query={parsed['lat']},{parsed['lng']}&query_place_id={parsed['place_id']}"
+        maps_link = f"https://www.google.com/maps/search/?api=1&query={parsed.lat},{parsed.lng}&query_place_id={quote_plus(parsed.place_id)}"
         
-        search_query = f"{company} {parsed['formatted_address']}".replace(' ', '+')
+        search_query = quote_plus(f"{company} {parsed.formatted_address}")
         search_link = f"https://www.google.com/search?q={search_query}"
         
         # NEW: Agentic AI Verification
@@ -139,7 +213,7 @@ class AddressLookupService:
             from src.agentic import AgenticVerifier
             print(f"🤖 Running Agentic AI Verification for {company}...")
             verifier = AgenticVerifier(api_key=ai_api_key)
-            ai_res = verifier.verify(company, parsed['formatted_address'])
+            ai_res = verifier.verify(company, parsed.formatted_address)
             
             ai_verification = {
                 "ai_status": ai_res.get("status", "error"),
@@ -149,29 +223,30 @@ class AddressLookupService:
             }
 
         # Build record
+        now = datetime.now(timezone.utc).isoformat(timespec='seconds')
         record = {
             'COMPANY NAME (RAW)': company,
             'COMPANY NAME (NORMALIZED)': company_normalized,
-            'STREET ADDRESS1': parsed['street_1'],
-            'STREET ADDRESS2': parsed['street_2'],
-            'CITY NAME': parsed['city'],
-            'STATE NAME': parsed['state_region'],
-            'PIN CODE': parsed['postal_code'],
-            'COUNTRY NAME': parsed['country_long'],
+            'STREET ADDRESS1': parsed.street_1,
+            'STREET ADDRESS2': parsed.street_2,
+            'CITY NAME': parsed.city,
+            'STATE NAME': parsed.state_region,
+            'PIN CODE': parsed.postal_code,
+            'COUNTRY NAME': parsed.country_long,
             'MAPS LINK': maps_link,
             'SEARCH LINK': search_link,
-            'LAT': parsed['lat'],
-            'LNG': parsed['lng'],
+            'LAT': parsed.lat,
+            'LNG': parsed.lng,
             'SOURCE': 'google',
-            'CONFIDENCE': parsed['confidence'],
-            'GEOCODER PLACE ID': parsed['place_id'],
-            'QA STATUS': 'auto' if parsed['confidence'] >= config.CONFIDENCE_THRESHOLD else 'review',
+            'CONFIDENCE': parsed.confidence,
+            'GEOCODER PLACE ID': parsed.place_id,
+            'QA STATUS': 'auto' if parsed.confidence >= self.confidence_threshold else 'review',
             'NOTES': ai_verification['ai_message'],
             'AI VERIFICATION STATUS': ai_verification['ai_status'],
             'AI CONFIDENCE': ai_verification['ai_confidence'],
             'AI SOURCE URL': ai_verification['ai_source_url'],
-            'CREATED AT': datetime.utcnow().isoformat(),
-            'UPDATED AT': datetime.utcnow().isoformat(),
+            'CREATED AT': now,
+            'UPDATED AT': now,
         }
         
         # Validate
@@ -181,11 +256,17 @@ class AddressLookupService:
             record['qa_status'] = 'review'
             record['notes'] = 'Validation issues: ' + '; '.join(errors)
         
-        # Store in Sheets
+        # Store in Sheets, or queue it for the next batched write; queued
+        # records are cached only once that write succeeds
+        if defer_write:
+            with self._pending_lock:
+                self._pending[(company_normalized, city_hint, country_hint)] = record
+            return record, 'geocoded'
+        
         success = self.storage.insert(record)
         
         if success:
-            print(f"✓ Saved to storage (confidence: {parsed['confidence']:.2f})")
+            print(f"✓ Saved to storage (confidence: {parsed.confidence:.2f})")
             # Update cache
             self.cache.set(record, company_normalized, city_hint, country_hint)
         else:
@@ -193,6 +274,81 @@ class AddressLookupService:
         
         return record, 'geocoded'
     
+    def build_index(self) -> RegistryIndex:
+        """
+        Fetch the whole registry once and index it for local matching.
+        
+        Returns:
+            RegistryIndex to pass to lookup()
+        """
+        self._init_storage()
+        return RegistryIndex(self.storage.get_all())
+    
+    def lookup_many(
+        self,
+        items: List[Tuple[str, Optional[str]]],
+        agentic_verify: bool = False,
+        ai_api_key: str = None
+    ) -> List[Tuple[Optional[Dict], str]]:
+        """
+        Look up many companies against a single registry fetch.
+        
+        Args:
+            items: List of (company, site_hint) tuples
+            agentic_verify: Whether to use AI for secondary verification
+            ai_api_key: Optional Gemini API key if not in config
+        
+        Returns:
+            List of (address_record, source) tuples, in input order
+        """
+        index = self.build_index()
+        
+        results = [
+            self.lookup(
+                company,
+                site_hint,
+                agentic_verify=agentic_verify,
+                ai_api_key=ai_api_key,
+                index=index,
+                defer_write=True
+            )
+            for company, site_hint in items
+        ]
+        
+        self.flush_pending()
+        return results
+    
+    def flush_pending(self) -> bool:
+        """
+        Write records queued by lookup(defer_write=True) in one Sheets call.
+        
+        Returns:
+            True if successful (including when nothing was queued)
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                queued = dict(self._pending)
+            
+            if not queued:
+                return True
+            
+            self._init_storage()
+            
+            # Records stay queued if the write fails, so the next flush retries them
+            if not self.storage.insert_many(list(queued.values())):
+                print(f"✗ Failed to save {len(queued)} records to storage")
+                return False
+            
+            for (company_normalized, city, country), record in queued.items():
+                self.cache.set(record, company_normalized, city, country)
+            
+            with self._pending_lock:
+                for key in queued:
+                    del self._pending[key]
+            
+            print(f"✓ Saved {len(queued)} records to storage")
+            return True
+    
     def get_stats(self) -> Dict:
         """Get service statistics."""
         self._init_storage()
@@ -1,8 +1,48 @@
 """
 Fuzzy matching and deduplication logic.
 """
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple
-from rapidfuzz import fuzz, process
+import numpy as np
+from rapidfuzz import fuzz, process, utils
+
+# Mean Earth radius used for haversine distances
+EARTH_RADIUS_KM = 6371.0
+
+# Registry names recur across lookups, so memoize their preprocessing
+_norm = lru_cache(maxsize=100_000)(utils.default_process)
+
+# Result count above which the compiled haversine kernel beats plain NumPy
+NUMBA_MIN_RESULTS = 512
+
+# Compiled haversine kernel, built on first use (False if numba is unavailable);
+# importing numba up front would slow every cold start for a rarely used path
+_haversine_kernel = None
+
+
+def _get_haversine_kernel():
+    """Return the numba haversine kernel, or None if numba isn't installed."""
+    global _haversine_kernel
+    
+    if _haversine_kernel is None:
+        try:
+            from numba import njit, prange
+        except ImportError:
+            _haversine_kernel = False
+            return None
+        
+        # Only mul-add contraction: full fastmath would assume away the NaNs used for bad coordinates
+        @njit(cache=True, fastmath={'contract'}, parallel=True)
+        def _haversine_terms(lats, lngs, tlat, tlng, cos_tlat):
+            """Haversine 'a' term for each point (radians in, unitless out)."""
+            a = np.empty(lats.shape[0])
+            for i in prange(lats.shape[0]):
+                a[i] = np.sin((lats[i] - tlat) / 2) ** 2 + cos_tlat * np.cos(lats[i]) * np.sin((lngs[i] - tlng) / 2) ** 2
+            return a
+        
+        _haversine_kernel = _haversine_terms
+    
+    return _haversine_kernel or None
 
 
 def find_best_match(
@@ -26,20 +66,30 @@ def find_best_match(
     if not candidates:
         return None
     
-    # Extract strings to match
-    choices = [(rec, rec.get(key_field, '')) for rec in candidates]
+    # Preprocess both sides once so the scorer doesn't redo it per comparison
+    choices = [_norm(rec.get(key_field, '')) for rec in candidates]
+    q = _norm(query)
+    
+    # Exact match (the usual case after normalization) needs no scoring
+    if q and q in choices:
+        return candidates[choices.index(q)], 100.0
     
-    # Find best match
+    if len(candidates) == 1:
+        score = fuzz.token_set_ratio(q, choices[0], processor=None)
+        return (candidates[0], score) if score >= threshold else None
+    
+    # Find best match; the cutoff lets rapidfuzz skip hopeless candidates
     result = process.extractOne(
-        query,
-        [choice[1] for choice in choices],
-        scorer=fuzz.token_set_ratio
+        q,
+        choices,
+        scorer=fuzz.token_set_ratio,
+        processor=None,
+        score_cutoff=threshold
     )
     
     if result:
         match_str, score, idx = result
-        if score >= threshold:
-            return choices[idx][0], score
+        return candidates[idx], score
     
     return None
 
@@ -55,12 +105,12 @@ def calculate_similarity(str1: str, str2: str) -> float:
     Returns:
         Similarity score (0-100)
     """
-    return fuzz.token_set_ratio(str1, str2)
+    return fuzz.token_set_ratio(_norm(str1), _norm(str2), processor=None)
 
 
 def deduplicate_results(
     results: List[Dict],
-    key_field: str =' company_normalized',
+    key_field: str = 'company_normalized',
     threshold: int = 95
 ) -> List[Dict]:
     """
@@ -77,24 +127,30 @@ def deduplicate_results(
     if not results:
         return []
     
+    records = [r for r in results if r.get(key_field, '')]
+    if not records:
+        return []
+    
+    # Pairwise similarity of all values at once (scores below threshold come back as 0)
+    values = [_norm(r[key_field]) for r in records]
+    sim = process.cdist(
+        values,
+        values,
+        scorer=fuzz.ratio,
+        processor=None,
+        score_cutoff=threshold,
+        dtype=np.float32,
+        workers=-1
+    )
+    
+    # Keep a record only if it isn't similar to an earlier kept record
+    kept = np.zeros(len(records), dtype=bool)
     unique = []
-    seen = []
     
-    for record in results:
-        value = record.get(key_field, '')
-        if not value:
-            continue
-        
-        # Check if similar to any seen value
-        is_duplicate = False
-        for seen_value in seen:
-            if fuzz.ratio(value, seen_value) >= threshold:
-                is_duplicate = True
-                break
-        
-        if not is_duplicate:
+    for i, record in enumerate(records):
+        if not np.any(sim[i, :i][kept[:i]] >= threshold):
+            kept[i] = True
             unique.append(record)
-            seen.append(value)
     
     return unique
 
@@ -102,7 +158,8 @@ def deduplicate_results(
 def rank_by_proximity(
     results: List[Dict],
     target_lat: float,
-    target_lng: float
+    target_lng: float,
+    limit: int = None
 ) -> List[Dict]:
     """
     Rank results by proximity to target coordinates.
@@ -111,35 +168,48 @@ def rank_by_proximity(
         results: List of records with lat/lng
         target_lat: Target latitude
         target_lng: Target longitude
+        limit: Optional number of closest results to return
     
     Returns:
-        Sorted list (closest first)
+        New list of records with '_distance_km' set, closest first
     """
-    from math import radians, cos, sin, asin, sqrt
-    
-    def haversine(lat1, lon1, lat2, lon2):
-        """Calculate distance between two points in km."""
-        lon1, lat1, lon2, lat2 = map(radians, [lon1, lat1, lon2, lat2])
-        dlon = lon2 - lon1
-        dlat = lat2 - lat1
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * asin(sqrt(a))
-        km = 6371 * c
-        return km
-    
-    # Calculate distances
-    for result in results:
-        try:
-            lat = float(result.get('lat', 0))
-            lng = float(result.get('lng', 0))
-            dist = haversine(target_lat, target_lng, lat, lng)
-            result['_distance_km'] = dist
-        except (ValueError, TypeError):
-            result['_distance_km'] = float('inf')
+    if not results:
+        return []
     
-    # Sort by distance
-    return sorted(results, key=lambda x: x.get('_distance_km', float('inf')))
+    lats = np.radians(np.fromiter((_to_float(r.get('lat', 0)) for r in results), dtype=np.float64, count=len(results)))
+    lngs = np.radians(np.fromiter((_to_float(r.get('lng', 0)) for r in results), dtype=np.float64, count=len(results)))
+    
+    tlat = np.radians(target_lat)
+    tlng = np.radians(target_lng)
+    cos_tlat = np.cos(tlat)
+    
+    # Haversine 'a' term is monotonic in distance, so rank on it directly
+    kernel = _get_haversine_kernel() if len(results) >= NUMBA_MIN_RESULTS else None
+    if kernel is not None:
+        a = kernel(lats, lngs, tlat, tlng, cos_tlat)
+    else:
+        a = np.sin((lats - tlat) / 2) ** 2 + cos_tlat * np.cos(lats) * np.sin((lngs - tlng) / 2) ** 2
+    
+    # Unparseable coordinates sort last
+    a[~np.isfinite(a)] = np.inf
+    
+    order = np.argsort(a, kind='stable')[:limit]
+    
+    # Only convert the returned results to kilometres
+    top = a[order]
+    distances = np.full(len(order), np.inf)
+    finite = np.isfinite(top)
+    distances[finite] = EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(np.clip(top[finite], 0.0, 1.0)))
+    
+    return [results[i] | {'_distance_km': float(d)} for i, d in zip(order, distances)]
+
 
+def _to_float(value) -> float:
+    """Convert a coordinate to float, using NaN for missing/invalid values."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return np.nan
 
 if __name__ == "__main__":
     # Test matching
@@ -3,10 +3,11 @@ Company name normalization module.
 Applies standardization rules to company names for consistent matching.
 """
 import re
-import json
 import unicodedata
+import orjson
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List
 
 # Legal suffixes to strip (ordered by specificity)
 LEGAL_SUFFIXES = [
@@ -33,16 +34,55 @@ LEGAL_SUFFIXES = [
     r'\bK\.?\s*K\.?\b',
 ]
 
+
+def _build_suffix_pattern(suffixes: List[str]) -> str:
+    """
+    Combine suffix patterns into one alternation grouped by first letter.
+    
+    The regex engine then tests a single first character at each position
+    instead of trying every alternative in turn. Every suffix is anchored
+    at the end of the string, so regrouping doesn't change what matches.
+    
+    Args:
+        suffixes: Patterns of the form \\b<letter>...
+    
+    Returns:
+        Regex source for the grouped alternation
+    """
+    groups: Dict[str, list] = {}
+    for suffix in suffixes:
+        body = suffix[len(r'\b'):]
+        groups.setdefault(body[0], []).append(body[1:])
+    
+    branches = [f"{first}(?:{'|'.join(rests)})" for first, rests in groups.items()]
+    return r'\b(?:' + '|'.join(branches) + ')'
+
+
 # Compile regex pattern
-LEGAL_SUFFIX_PATTERN = re.compile('(' + '|'.join(LEGAL_SUFFIXES) + r')$', re.IGNORECASE)
+LEGAL_SUFFIX_PATTERN = re.compile('(' + _build_suffix_pattern(LEGAL_SUFFIXES) + r')$', re.IGNORECASE)
+
+# Endings of every legal suffix once spaces are removed; names not ending in
+# one of these can't match LEGAL_SUFFIX_PATTERN
+_SUFFIX_HINTS = (
+    'LIMITED', 'LTD', 'LLC', 'LLP', 'PLC', 'INC', 'CORP', 'GMBH',
+    'SAS', 'SA', 'BV', 'NV', 'AG', 'KK',
+)
+
+# Commas are dropped, periods become word breaks
+_PUNCT_TRANS = str.maketrans({',': None, '.': ' '})
+
+# Filler words dropped from the "without common words" variant
+_COMMON_WORDS = frozenset(['THE', 'AND', 'OF', 'GROUP', 'COMPANY', 'COMPANIES'])
 
 # Cache for golden mappings
 _golden_mappings: Dict[str, str] = {}
+# Longest mapping key, bounding the prefixes worth looking up
+_golden_max_len = 0
 
 
 def load_golden_mappings(filepath: Path = None) -> Dict[str, str]:
     """Load golden company name mappings from JSON file."""
-    global _golden_mappings
+    global _golden_mappings, _golden_max_len
     
     if _golden_mappings:
         return _golden_mappings
@@ -52,21 +92,25 @@ def load_golden_mappings(filepath: Path = None) -> Dict[str, str]:
         filepath = config.GOLDEN_MAPPINGS_FILE
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            _golden_mappings = json.load(f)
+        with open(filepath, 'rb') as f:
+            _golden_mappings = orjson.loads(f.read())
+        _golden_max_len = max(map(len, _golden_mappings), default=0)
         return _golden_mappings
     except FileNotFoundError:
         print(f"Warning: Golden mappings file not found: {filepath}")
         return {}
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"Warning: Invalid JSON in golden mappings file: {e}")
         return {}
 
 
+@lru_cache(maxsize=131072)
 def normalize_company(name: str, use_golden_mappings: bool = True) -> str:
     """
     Normalize company name using standardization rules.
     
+    Results are memoized, since batch inputs repeat the same names.
+    
     Args:
         name: Raw company name
         use_golden_mappings: Whether to apply golden mapping expansions
@@ -85,43 +129,61 @@ def normalize_company(name: str, use_golden_mappings: bool = True) -> str:
     if not name or not isinstance(name, str):
         return ""
     
-    # 1. Unicode normalization (handle special characters)
-    s = unicodedata.normalize("NFKC", name)
-    
-    # 2. Trim and collapse whitespace
-    s = s.strip()
-    s = re.sub(r'\s+', ' ', s)
+    # 1. Unicode normalization (handle special characters; ASCII is already NFKC)
+    s = name if name.isascii() else unicodedata.normalize("NFKC", name)
     
-    # 3. Convert to uppercase
+    # 2. Convert to uppercase
     s = s.upper()
     
-    # 4. Remove common punctuation that doesn't add meaning
-    s = s.replace(',', '').replace('.', ' ')
-    s = re.sub(r'\s+', ' ', s).strip()
+    # 3. Remove common punctuation that doesn't add meaning, then trim and
+    #    collapse whitespace (split/join does both in one pass)
+    s = ' '.join(s.translate(_PUNCT_TRANS).split())
     
-    # 5. Apply golden mappings (before suffix stripping for exact matches)
+    # 4. Apply golden mappings (before suffix stripping for exact matches)
     if use_golden_mappings:
         mappings = load_golden_mappings()
         # Check if the entire normalized name matches
         if s in mappings:
             return mappings[s]
         
-        # Check if the name starts with a known acronym
-        for acronym, full_name in sorted(mappings.items(), key=lambda x: -len(x[0])):
-            if s == acronym or s.startswith(acronym + " "):
-                s = s.replace(acronym, full_name, 1)
+        # Check if the name starts with a known acronym, trying the
+        # longest whole-word prefix first
+        end = _golden_max_len + 1
+        while (end := s.rfind(' ', 0, end)) > 0:
+            acronym = s[:end]
+            if acronym in mappings:
+                s = mappings[acronym] + s[end:]
                 break
     
-    # 6. Strip legal suffixes
-    s = LEGAL_SUFFIX_PATTERN.sub('', s).strip()
+    # 5. Strip legal suffixes (most names end in none, so check cheaply first)
+    if s[-16:].replace(' ', '').endswith(_SUFFIX_HINTS):
+        s = LEGAL_SUFFIX_PATTERN.sub('', s).strip()
     
-    # 7. Final cleanup
-    s = re.sub(r'\s+', ' ', s).strip()
+    # 6. Final cleanup
+    s = ' '.join(s.split())
     
     return s
 
 
-def get_normalization_variants(name: str) -> list:
+def normalize_company_batch(names: List[str], use_golden_mappings: bool = True) -> List[str]:
+    """
+    Normalize many company names, doing the work once per distinct name.
+    
+    Args:
+        names: Raw company names
+        use_golden_mappings: Whether to apply golden mapping expansions
+    
+    Returns:
+        Normalized names, in input order
+    """
+    normalized = {
+        name: normalize_company(name, use_golden_mappings)
+        for name in dict.fromkeys(names)
+    }
+    return [normalized[name] for name in names]
+
+
+def get_normalization_variants(name: str) -> List[str]:
     """
     Get multiple normalization variants of a company name for fuzzy matching.
     
@@ -141,9 +203,8 @@ def get_normalization_variants(name: str) -> list:
     variants.add(normalize_company(name, use_golden_mappings=False))
     
     # Remove common words
-    common_words = ['THE', 'AND', 'OF', 'GROUP', 'COMPANY', 'COMPANIES']
     words = normalized.split()
-    filtered = ' '.join([w for w in words if w not in common_words])
+    filtered = ' '.join([w for w in words if w not in _COMMON_WORDS])
     if filtered:
         variants.add(filtered)
     
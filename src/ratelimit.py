@@ -0,0 +1,83 @@
+"""
+Client-side rate limiting and retry helpers for outbound API calls.
+Keeps concurrent lookups under the configured QPS instead of bursting into 429s.
+"""
+import random
+import threading
+import time
+from collections import deque
+from typing import Callable, Tuple, Type
+
+
+class TokenBucket:
+    """Thread-safe sliding-window limiter allowing `qps` calls per second."""
+    
+    def __init__(self, qps: int, period: float = 1.0):
+        """
+        Initialize limiter.
+        
+        Args:
+            qps: Maximum calls permitted per period
+            period: Window length in seconds
+        """
+        if qps < 1:
+            raise ValueError("qps must be at least 1")
+        
+        self.qps = qps
+        self.period = period
+        self._sent = deque()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a call slot is available, then claim it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                
+                # Drop timestamps that have left the window
+                while self._sent and now - self._sent[0] >= self.period:
+                    self._sent.popleft()
+                
+                if len(self._sent) < self.qps:
+                    self._sent.append(now)
+                    return
+                
+                wait = self.period - (now - self._sent[0])
+            
+            # Sleep outside the lock so other threads can check the window
+            time.sleep(wait)
+
+
+def call_with_backoff(
+    func: Callable,
+    *args,
+    retry_on: Tuple[Type[Exception], ...] = (),
+    should_retry: Callable[[Exception], bool] = None,
+    attempts: int = 5,
+    initial: float = 0.2,
+    max_delay: float = 8.0,
+    **kwargs
+):
+    """
+    Call a function, retrying transient failures with jittered exponential backoff.
+    
+    Args:
+        func: Callable to invoke
+        retry_on: Exception types that may be retried
+        should_retry: Optional predicate to further filter retryable exceptions
+        attempts: Maximum number of attempts (including the first)
+        initial: Delay before the first retry (seconds)
+        max_delay: Upper bound on any single delay (seconds)
+    
+    Returns:
+        Result of func
+    """
+    for attempt in range(attempts):
+        try:
+            return func(*args, **kwargs)
+        except retry_on as e:
+            if attempt == attempts - 1 or (should_retry and not should_retry(e)):
+                raise
+            
+            delay = min(max_delay, initial * (2 ** attempt))
+            time.sleep(delay + random.uniform(0, delay))
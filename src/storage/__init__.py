@@ -1,5 +1,19 @@
 # Storage module
+import importlib
+
 from .cache import Cache, get_cache
-from .sheets_io import SheetsStorage
+from .index import RegistryIndex
+
+# SheetsStorage pulls in gspread/google-auth, so import it on first access
+_LAZY_IMPORTS = {
+    'SheetsStorage': '.sheets_io',
+}
+
+__all__ = ['Cache', 'get_cache', 'RegistryIndex', 'SheetsStorage']
+
 
-__all__ = ['Cache', 'get_cache', 'SheetsStorage']
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,19 +3,29 @@ Multi-tier caching for geocoding results.
 Supports in-memory and SQLite caching.
 """
 import sqlite3
-import json
-import hashlib
-from datetime import datetime, timedelta
-from typing import Optional, Dict
+import threading
+from collections import OrderedDict
+import orjson
+import time
+from typing import Optional, Dict, Tuple
 from pathlib import Path
 
 from .. import config
 
+# Bump when the cache table layout changes; older tables are dropped
+SCHEMA_VERSION = 3
+
+# Cache key: (company, city, country, place_id), uppercased, '' when absent
+CacheKey = Tuple[str, str, str, str]
+
+# How long a SQLite miss is remembered before the database is asked again
+NEGATIVE_TTL_SECONDS = 60
+
 
 class Cache:
     """Multi-tier cache for address lookups."""
     
-    def __init__(self, cache_type: str = None, db_path: str = None):
+    def __init__(self, cache_type: str = None, db_path: str = None) -> None:
         """
         Initialize cache.
         
@@ -26,30 +36,57 @@ class Cache:
         self.cache_type = cache_type or config.CACHE_TYPE
         self.db_path = db_path or config.CACHE_DB_PATH
         self.ttl_hours = config.CACHE_TTL_HOURS
+        self._ttl_seconds = self.ttl_hours * 3600
         self.max_size = config.MAX_CACHE_SIZE
         
-        # In-memory cache
-        self.memory_cache: Dict[str, tuple] = {}  # key -> (value, timestamp)
+        # In-memory cache, least recently used first
+        self.memory_cache: OrderedDict[CacheKey, tuple] = OrderedDict()  # key -> (value, timestamp)
+        self._memory_lock = threading.Lock()
         
-        # SQLite cache
+        # Recent SQLite misses, oldest first (guarded by _memory_lock)
+        self._misses: OrderedDict[CacheKey, float] = OrderedDict()  # key -> expiry (monotonic)
+        
+        # SQLite cache (one connection, shared by all threads under a lock)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
         if self.cache_type == 'sqlite':
             self._init_sqlite()
     
-    def _init_sqlite(self):
-        """Initialize SQLite cache database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def _init_sqlite(self) -> None:
+        """Open the SQLite cache database and create/upgrade its table."""
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256,
+        )
+        
+        # WAL makes commits cheap; NORMAL sync is safe with WAL
+        conn.executescript(
+            'PRAGMA journal_mode=WAL;'
+            'PRAGMA synchronous=NORMAL;'
+            'PRAGMA temp_store=MEMORY;'
+        )
+        
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version < SCHEMA_VERSION:
+            # Entries are disposable, so older layouts are simply discarded
+            conn.execute('DROP TABLE IF EXISTS cache')
+            conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
         
-        cursor.execute('''
+        conn.execute('''
             CREATE TABLE IF NOT EXISTS cache (
-                key TEXT PRIMARY KEY,
-                value TEXT NOT NULL,
-                timestamp TEXT NOT NULL
-            )
+                company TEXT NOT NULL,
+                city TEXT NOT NULL,
+                country TEXT NOT NULL,
+                place_id TEXT NOT NULL,
+                value BLOB NOT NULL,
+                timestamp REAL NOT NULL,
+                PRIMARY KEY (company, city, country, place_id)
+            ) WITHOUT ROWID
         ''')
         
-        conn.commit()
-        conn.close()
+        self._conn = conn
     
     def _make_key(
         self,
@@ -57,7 +94,7 @@ class Cache:
         city: str = None,
         country: str = None,
         place_id: str = None
-    ) -> str:
+    ) -> CacheKey:
         """
         Create cache key from lookup parameters.
         
@@ -68,24 +105,18 @@ class Cache:
             place_id: Optional place ID
         
         Returns:
-            Cache key string
+            Cache key tuple
         """
+        # A place ID identifies the location on its own
         if place_id:
-            return f"placeid:{place_id}"
+            return ('', '', '', place_id)
         
-        parts = [company_normalized.upper()]
-        if city:
-            parts.append(city.upper())
-        if country:
-            parts.append(country.upper())
-        
-        # Create hash for long keys
-        key_str = '|'.join(parts)
-        if len(key_str) > 100:
-            hash_obj = hashlib.md5(key_str.encode())
-            return f"lookup:{hash_obj.hexdigest()}"
-        
-        return f"lookup:{key_str}"
+        return (
+            company_normalized.upper(),
+            city.upper() if city else '',
+            country.upper() if country else '',
+            '',
+        )
     
     def get(
         self,
@@ -112,20 +143,54 @@ class Cache:
         key = self._make_key(company_normalized, city, country, place_id)
         
         # Try memory cache first
-        if key in self.memory_cache:
-            value, timestamp = self.memory_cache[key]
-            if self._is_fresh(timestamp):
-                return value
-            else:
-                # Expired, remove from memory
-                del self.memory_cache[key]
+        with self._memory_lock:
+            entry = self.memory_cache.get(key)
+            if entry is not None:
+                value, timestamp = entry
+                if self._is_fresh(timestamp):
+                    self.memory_cache.move_to_end(key)
+                    return value
+                else:
+                    # Expired, remove from memory
+                    del self.memory_cache[key]
+            
+            # Skip SQLite for keys it recently didn't have
+            expiry = self._misses.get(key)
+            if expiry is not None:
+                if time.monotonic() < expiry:
+                    return None
+                del self._misses[key]
         
         # Try SQLite cache
         if self.cache_type == 'sqlite':
-            return self._get_from_sqlite(key)
+            value = self._get_from_sqlite(key)
+            if value is None:
+                self._remember_miss(key)
+            return value
         
         return None
     
+    def _remember(self, key: CacheKey, value: Dict, timestamp: float) -> None:
+        """Store an entry in the memory cache, evicting the least recently used when full."""
+        with self._memory_lock:
+            self.memory_cache[key] = (value, timestamp)
+            self.memory_cache.move_to_end(key)
+            
+            # Enforce size limit by dropping least recently used entries
+            while len(self.memory_cache) > self.max_size:
+                self.memory_cache.popitem(last=False)
+            
+            self._misses.pop(key, None)
+    
+    def _remember_miss(self, key: CacheKey) -> None:
+        """Record a SQLite miss so repeat lookups skip the database for a while."""
+        with self._memory_lock:
+            self._misses[key] = time.monotonic() + NEGATIVE_TTL_SECONDS
+            self._misses.move_to_end(key)
+            
+            while len(self._misses) > self.max_size:
+                self._misses.popitem(last=False)
+    
     def set(
         self,
         record: Dict,
@@ -133,7 +198,7 @@ class Cache:
         city: str = None,
         country: str = None,
         place_id: str = None
-    ):
+    ) -> None:
         """
         Store address record in cache.
         
@@ -148,44 +213,32 @@ class Cache:
             return
         
         key = self._make_key(company_normalized, city, country, place_id)
-        timestamp = datetime.utcnow().isoformat()
+        timestamp = time.time()
         
         # Store in memory cache
-        self.memory_cache[key] = (record, timestamp)
-        
-        # Enforce size limit
-        if len(self.memory_cache) > self.max_size:
-            # Remove oldest entries
-            sorted_items = sorted(
-                self.memory_cache.items(),
-                key=lambda x: x[1][1]  # Sort by timestamp
-            )
-            # Keep newest 80%
-            keep_count = int(self.max_size * 0.8)
-            self.memory_cache = dict(sorted_items[-keep_count:])
+        self._remember(key, record, timestamp)
         
         # Store in SQLite cache
         if self.cache_type == 'sqlite':
             self._set_in_sqlite(key, record, timestamp)
     
-    def _get_from_sqlite(self, key: str) -> Optional[Dict]:
+    def _get_from_sqlite(self, key: CacheKey) -> Optional[Dict]:
         """Get value from SQLite cache."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute(
-                'SELECT value, timestamp FROM cache WHERE key = ?',
-                (key,)
-            )
-            
-            row = cursor.fetchone()
-            conn.close()
+            with self._lock:
+                row = self._conn.execute(
+                    'SELECT value, timestamp FROM cache '
+                    'WHERE company = ? AND city = ? AND country = ? AND place_id = ?',
+                    key
+                ).fetchone()
             
             if row:
                 value_json, timestamp = row
                 if self._is_fresh(timestamp):
-                    return json.loads(value_json)
+                    # Promote so repeat lookups skip SQLite; keeps the original expiry
+                    value = orjson.loads(value_json)
+                    self._remember(key, value, timestamp)
+                    return value
                 else:
                     # Expired, remove it
                     self._delete_from_sqlite(key)
@@ -196,54 +249,45 @@ class Cache:
             print(f"SQLite cache read error: {e}")
             return None
     
-    def _set_in_sqlite(self, key: str, value: Dict, timestamp: str):
+    def _set_in_sqlite(self, key: CacheKey, value: Dict, timestamp: float) -> None:
         """Set value in SQLite cache."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute(
-                'INSERT OR REPLACE INTO cache (key, value, timestamp) VALUES (?, ?, ?)',
-                (key, json.dumps(value), timestamp)
-            )
-            
-            conn.commit()
-            conn.close()
+            with self._lock:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO cache '
+                    '(company, city, country, place_id, value, timestamp) VALUES (?, ?, ?, ?, ?, ?)',
+                    (*key, orjson.dumps(value), timestamp)
+                )
         
         except Exception as e:
             print(f"SQLite cache write error: {e}")
     
-    def _delete_from_sqlite(self, key: str):
+    def _delete_from_sqlite(self, key: CacheKey) -> None:
         """Delete expired entry from SQLite cache."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM cache WHERE key = ?', (key,))
-            conn.commit()
-            conn.close()
+            with self._lock:
+                self._conn.execute(
+                    'DELETE FROM cache '
+                    'WHERE company = ? AND city = ? AND country = ? AND place_id = ?',
+                    key
+                )
         except Exception:
             pass
     
-    def _is_fresh(self, timestamp: str) -> bool:
+    def _is_fresh(self, timestamp: float) -> bool:
         """Check if cached entry is still fresh."""
-        try:
-            cached_time = datetime.fromisoformat(timestamp)
-            age = datetime.utcnow() - cached_time
-            return age < timedelta(hours=self.ttl_hours)
-        except Exception:
-            return False
+        return time.time() - timestamp < self._ttl_seconds
     
-    def clear(self):
+    def clear(self) -> None:
         """Clear all caches."""
-        self.memory_cache.clear()
+        with self._memory_lock:
+            self.memory_cache.clear()
+            self._misses.clear()
         
         if self.cache_type == 'sqlite':
             try:
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                cursor.execute('DELETE FROM cache')
-                conn.commit()
-                conn.close()
+                with self._lock:
+                    self._conn.execute('DELETE FROM cache')
             except Exception as e:
                 print(f"Error clearing SQLite cache: {e}")
     
@@ -254,11 +298,8 @@ class Cache:
         
         if self.cache_type == 'sqlite':
             try:
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                cursor.execute('SELECT COUNT(*) FROM cache')
-                sqlite_count = cursor.fetchone()[0]
-                conn.close()
+                with self._lock:
+                    sqlite_count = self._conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
             except Exception:
                 pass
         
@@ -272,7 +313,7 @@ class Cache:
 
 
 # Global cache instance
-_cache = None
+_cache: Optional[Cache] = None
 
 def get_cache() -> Cache:
     """Get global cache instance."""
@@ -0,0 +1,200 @@
+"""
+In-memory index over address registry records.
+Lets batch lookups serve exact and fuzzy matches from a single Sheets read.
+"""
+from typing import Optional, List, Dict
+import numpy as np
+from rapidfuzz import fuzz, process
+
+# Length of the token prefix used to shortlist fuzzy candidates
+PREFIX_LEN = 3
+
+
+def _token_prefixes(name: str) -> set:
+    """Distinct leading characters of each word in a name."""
+    return {token[:PREFIX_LEN] for token in name.split()}
+
+
+def _confidence(record: Dict) -> float:
+    """Record confidence as float, NaN if unparseable (missing counts as 1.0)."""
+    try:
+        return float(record.get('confidence', 1.0))
+    except (ValueError, TypeError):
+        return np.nan
+
+
+class RegistryIndex:
+    """Snapshot of registry records indexed by normalized company name."""
+    
+    def __init__(self, records: List[Dict]):
+        """
+        Build index from registry records.
+        
+        Args:
+            records: Records as returned by SheetsStorage.get_all()
+        """
+        self.records = records
+        # Uppercased normalized name per record, aligned with records
+        self.names: List[str] = []
+        self.by_name: Dict[str, List[Dict]] = {}
+        self.by_country: Dict[str, List[Dict]] = {}
+        # Word prefix -> positions in records
+        self.by_prefix: Dict[str, List[int]] = {}
+        self.by_place_id: Dict[str, Dict] = {}
+        # Confidence per record, built on first low-confidence query
+        self._confidences: Optional[np.ndarray] = None
+        
+        for record in records:
+            self.add(record)
+    
+    def add(self, record: Dict):
+        """
+        Add a record to the index.
+        
+        Args:
+            record: Registry record (already present in records, in order)
+        """
+        self._confidences = None
+        
+        place_id = record.get('geocoder_place_id')
+        if place_id:
+            self.by_place_id.setdefault(place_id, record)
+        
+        position = len(self.names)
+        name = str(record.get('company_normalized', '')).upper()
+        self.names.append(name)
+        if not name:
+            return
+        
+        self.by_name.setdefault(name, []).append(record)
+        
+        # Records without a country match any country filter
+        country = str(record.get('country', '')).upper()
+        self.by_country.setdefault(country, []).append(record)
+        
+        for prefix in _token_prefixes(name):
+            self.by_prefix.setdefault(prefix, []).append(position)
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def find_by_exact_match(
+        self,
+        company_normalized: str,
+        city: str = None,
+        country: str = None
+    ) -> Optional[Dict]:
+        """
+        Find record by exact match on company name and optional location.
+        
+        Args:
+            company_normalized: Normalized company name
+            city: Optional city filter
+            country: Optional country filter
+        
+        Returns:
+            Matching record or None
+        """
+        for record in self.by_name.get(company_normalized.upper(), []):
+            # Check city match if provided
+            if city and record.get('city'):
+                if str(record['city']).upper() != city.upper():
+                    continue
+            
+            # Check country match if provided
+            if country and record.get('country'):
+                if str(record['country']).upper() != country.upper():
+                    continue
+            
+            return record
+        
+        return None
+    
+    def find_position(self, company_normalized: str) -> Optional[int]:
+        """
+        Find the position of the first record with a given company name.
+        
+        Args:
+            company_normalized: Normalized company name
+        
+        Returns:
+            Index into records, or None if not found
+        """
+        name = company_normalized.upper()
+        if not name or name not in self.by_name:
+            return None
+        return self.names.index(name)
+    
+    def find_by_place_id(self, place_id: str) -> Optional[Dict]:
+        """
+        Find record by geocoder place ID.
+        
+        Args:
+            place_id: Geocoder place ID
+        
+        Returns:
+            Matching record or None
+        """
+        if not place_id:
+            return None
+        return self.by_place_id.get(place_id)
+    
+    def search_fuzzy(self, company_normalized: str, country: str = None, limit: int = 5) -> List[Dict]:
+        """
+        Search for similar company names (fuzzy matching).
+        
+        Only records sharing at least one word prefix with the query are
+        scored, which keeps lookups fast on large registries.
+        
+        Args:
+            company_normalized: Normalized company name
+            country: Optional country filter
+            limit: Maximum results to return
+        
+        Returns:
+            List of similar records
+        """
+        query = company_normalized.upper()
+        
+        # Shortlist by shared word prefix, deduplicating records hit by several prefixes
+        shortlist = set()
+        for prefix in _token_prefixes(query):
+            shortlist.update(self.by_prefix.get(prefix, ()))
+        
+        candidates = sorted(shortlist)
+        if country:
+            allowed = {country.upper(), ''}
+            candidates = [i for i in candidates if str(self.records[i].get('country', '')).upper() in allowed]
+        
+        # Score all candidates in one call; results come back best first
+        results = process.extract(
+            query,
+            [self.names[i] for i in candidates],
+            scorer=fuzz.token_set_ratio,
+            processor=None,
+            score_cutoff=80,  # 80% threshold
+            limit=limit
+        )
+        
+        # Copy so indexed records stay free of per-query scores
+        return [self.records[candidates[idx]] | {'_similarity': score} for _, score, idx in results]
+    
+    def find_low_confidence(self, threshold: float) -> List[Dict]:
+        """
+        Find records whose confidence is below a threshold.
+        
+        Records with unparseable confidence values are skipped.
+        
+        Args:
+            threshold: Confidence threshold
+        
+        Returns:
+            List of low-confidence records
+        """
+        if self._confidences is None:
+            self._confidences = np.fromiter(
+                (_confidence(r) for r in self.records), dtype=float, count=len(self.records)
+            )
+        
+        # NaN compares False, so unparseable values drop out of the mask
+        return [self.records[i] for i in np.flatnonzero(self._confidences < threshold)]
@@ -2,13 +2,20 @@
 Google Sheets storage adapter.
 Handles reading and writing address data to Google Sheets.
 """
+import threading
+import time
+from operator import itemgetter
 import gspread
+from gspread.utils import rowcol_to_a1
+from google.auth.transport.requests import AuthorizedSession
 from google.oauth2.service_account import Credentials
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, List, Dict
 from pathlib import Path
 
 from .. import config
+from ..http_pool import api_retry, mount_pool
+from .index import RegistryIndex
 
 
 class SheetsStorage:
@@ -37,6 +44,12 @@ class SheetsStorage:
         "UPDATED AT",
     ]
     
+    # Pulls a record's values in column order in a single call
+    _ROW_GET = itemgetter(*COLUMNS)
+    _ROW_DEFAULTS = dict.fromkeys(COLUMNS, '')
+    # 1-indexed sheet column for each field
+    _COL_IDX = {col: i for i, col in enumerate(COLUMNS, start=1)}
+    
     def __init__(self, sheet_id: str = None, worksheet_name: str = None, service_account_file: str = None):
         """
         Initialize Sheets storage.
@@ -57,6 +70,13 @@ class SheetsStorage:
             raise FileNotFoundError(f"Service account file not found: {self.service_account_file}")
         
         self.worksheet = None
+        self.index_ttl = config.REGISTRY_CACHE_SECONDS
+        
+        # Local snapshot of the sheet, so reads don't each fetch every row
+        self._index = None
+        self._index_loaded_at = 0.0
+        self._index_lock = threading.Lock()
+        
         self._connect()
     
     def _connect(self):
@@ -71,7 +91,9 @@ class SheetsStorage:
             scopes=scopes
         )
         
-        client = gspread.authorize(creds)
+        # Pooled session with retries on transient/quota errors
+        session = mount_pool(AuthorizedSession(creds), retries=api_retry())
+        client = gspread.authorize(creds, session=session)
         spreadsheet = client.open_by_key(self.sheet_id)
         
         # Get or create worksheet
@@ -87,6 +109,27 @@ class SheetsStorage:
             self.worksheet.append_row(self.COLUMNS)
             print(f"Created new worksheet: {self.worksheet_name}")
     
+    def _load(self, fresh: bool = False) -> RegistryIndex:
+        """
+        Get the indexed snapshot of all rows, re-reading the sheet when stale.
+        
+        Args:
+            fresh: Re-read the sheet even if the snapshot is within its TTL
+        
+        Returns:
+            RegistryIndex over the current sheet contents
+        """
+        with self._index_lock:
+            if fresh or self._index is None or time.monotonic() - self._index_loaded_at > self.index_ttl:
+                self._index = RegistryIndex(self.worksheet.get_all_records())
+                self._index_loaded_at = time.monotonic()
+            return self._index
+    
+    def _invalidate(self):
+        """Drop the local snapshot after writing to the sheet."""
+        with self._index_lock:
+            self._index = None
+    
     def find_by_exact_match(
         self,
         company_normalized: str,
@@ -104,23 +147,7 @@ class SheetsStorage:
         Returns:
             Matching record or None
         """
-        all_records = self.worksheet.get_all_records()
-        
-        for record in all_records:
-            if record['company_normalized'].upper() == company_normalized.upper():
-                # Check city match if provided
-                if city and record.get('city'):
-                    if record['city'].upper() != city.upper():
-                        continue
-                
-                # Check country match if provided
-                if country and record.get('country'):
-                    if record['country'].upper() != country.upper():
-                        continue
-                
-                return record
-        
-        return None
+        return self._load().find_by_exact_match(company_normalized, city=city, country=country)
     
     def find_by_place_id(self, place_id: str) -> Optional[Dict]:
         """
@@ -132,16 +159,7 @@ class SheetsStorage:
         Returns:
             Matching record or None
         """
-        if not place_id:
-            return None
-        
-        all_records = self.worksheet.get_all_records()
-        
-        for record in all_records:
-            if record.get('geocoder_place_id') == place_id:
-                return record
-        
-        return None
+        return self._load().find_by_place_id(place_id)
     
     def search_fuzzy(self, company_normalized: str, country: str = None, limit: int = 5) -> List[Dict]:
         """
@@ -155,34 +173,20 @@ class SheetsStorage:
         Returns:
             List of similar records
         """
-        from rapidfuzz import fuzz
-        
-        all_records = self.worksheet.get_all_records()
-        matches = []
-        
-        for record in all_records:
-            # Filter by country if specified
-            if country and record.get('country'):
-                if record['country'].upper() != country.upper():
-                    continue
-            
-            # Calculate similarity
-            record_name = record.get('company_normalized', '')
-            if not record_name:
-                continue
-            
-            similarity = fuzz.token_set_ratio(
-                company_normalized.upper(),
-                record_name.upper()
-            )
-            
-            if similarity >= 80:  # 80% threshold
-                record['_similarity'] = similarity
-                matches.append(record)
-        
-        # Sort by similarity and return top results
-        matches.sort(key=lambda x: x['_similarity'], reverse=True)
-        return matches[:limit]
+        return self._load().search_fuzzy(company_normalized, country=country, limit=limit)
+    
+    def _to_row(self, record: Dict) -> List[str]:
+        """
+        Convert a record to a sheet row in column order.
+        
+        Args:
+            record: Address record dict
+        
+        Returns:
+            Cell values (missing or None fields become empty strings)
+        """
+        values = self._ROW_GET({**self._ROW_DEFAULTS, **record})
+        return ['' if v is None else str(v) for v in values]
     
     def insert(self, record: Dict) -> bool:
         """
@@ -195,20 +199,49 @@ class SheetsStorage:
             True if successful
         """
         # Add timestamps
-        now = datetime.utcnow().isoformat()
+        now = datetime.now(timezone.utc).isoformat(timespec='seconds')
         record.setdefault('created_at', now)
         record.setdefault('updated_at', now)
         
         # Build row in column order
-        row = [str(record.get(col, '')) for col in self.COLUMNS]
+        row = self._to_row(record)
         
         try:
             self.worksheet.append_row(row)
+            self._invalidate()
             return True
         except Exception as e:
             print(f"Error inserting record: {e}")
             return False
     
+    def insert_many(self, records: List[Dict]) -> bool:
+        """
+        Insert several address records in a single Sheets API call.
+        
+        Args:
+            records: Address record dicts
+        
+        Returns:
+            True if successful
+        """
+        if not records:
+            return True
+        
+        now = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        rows = []
+        for record in records:
+            record.setdefault('created_at', now)
+            record.setdefault('updated_at', now)
+            rows.append(self._to_row(record))
+        
+        try:
+            self.worksheet.append_rows(rows, value_input_option='RAW')
+            self._invalidate()
+            return True
+        except Exception as e:
+            print(f"Error inserting {len(rows)} records: {e}")
+            return False
+    
     def update(self, company_normalized: str, updates: Dict) -> bool:
         """
         Update existing record.
@@ -220,23 +253,32 @@ class SheetsStorage:
         Returns:
             True if successful
         """
-        # Find the row
-        all_records = self.worksheet.get_all_records()
-        
-        for idx, record in enumerate(all_records, start=2):  # Start at 2 (1 is header)
-            if record['company_normalized'].upper() == company_normalized.upper():
-                # Update timestamp
-                updates['updated_at'] = datetime.utcnow().isoformat()
-                
-                # Update cells
-                for col_name, value in updates.items():
-                    if col_name in self.COLUMNS:
-                        col_idx = self.COLUMNS.index(col_name) + 1  # 1-indexed
-                        self.worksheet.update_cell(idx, col_idx, str(value))
-                
-                return True
-        
-        return False
+        # Find the row in a fresh read: the snapshot may predate a sort or
+        # delete in the shared sheet, and a stale row number would overwrite
+        # some other record
+        position = self._load(fresh=True).find_position(company_normalized)
+        if position is None:
+            return False
+        row = position + 2  # 1-indexed, plus the header row
+        
+        # Update timestamp
+        updates['updated_at'] = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        
+        # Update all changed cells in one request
+        cells = [
+            {
+                'range': rowcol_to_a1(row, self._COL_IDX[col_name]),
+                'values': [[str(value)]],
+            }
+            for col_name, value in updates.items()
+            if col_name in self._COL_IDX
+        ]
+        if cells:
+            # RAW, like inserts, so values aren't re-parsed by Sheets
+            self.worksheet.batch_update(cells, value_input_option='RAW')
+            self._invalidate()
+        
+        return True
     
     def get_all(self, limit: int = None) -> List[Dict]:
         """
@@ -248,7 +290,7 @@ class SheetsStorage:
         Returns:
             List of records
         """
-        records = self.worksheet.get_all_records()
+        records = list(self._load().records)
         if limit:
             return records[:limit]
         return records
@@ -266,18 +308,7 @@ class SheetsStorage:
         if threshold is None:
             threshold = config.CONFIDENCE_THRESHOLD
         
-        all_records = self.worksheet.get_all_records()
-        low_confidence = []
-        
-        for record in all_records:
-            try:
-                confidence = float(record.get('confidence', 1.0))
-                if confidence < threshold:
-                    low_confidence.append(record)
-            except (ValueError, TypeError):
-                continue
-        
-        return low_confidence
+        return self._load().find_low_confidence(threshold)
     
     def get_stats(self) -> Dict:
         """
@@ -286,7 +317,7 @@ class SheetsStorage:
         Returns:
             Dict with stats
         """
-        all_records = self.worksheet.get_all_records()
+        all_records = self._load().records
         
         total = len(all_records)
         auto = sum(1 for r in all_records if r.get('qa_status') == 'auto')
@@ -2,32 +2,70 @@
 Data validation and quality control functions.
 """
 import re
+from functools import lru_cache
 from typing import Optional, Dict, List
 
 
-# Postal code patterns by country
+# Postal code patterns by country, compiled once at import
 POSTAL_CODE_PATTERNS = {
-    'IN': r'^\d{6}$',  # India: 6 digits
-    'US': r'^\d{5}(-\d{4})?$',  # USA: 5 or 5+4 digits
-    'GB': r'^[A-Z]{1,2}\d{1,2}[A-Z]?\s?\d[A-Z]{2}$',  # UK
-    'CA': r'^[A-Z]\d[A-Z]\s?\d[A-Z]\d$',  # Canada
-    'AU': r'^\d{4}$',  # Australia: 4 digits
-    'DE': r'^\d{5}$',  # Germany: 5 digits
-    'FR': r'^\d{5}$',  # France: 5 digits
-    'JP': r'^\d{3}-?\d{4}$',  # Japan: 3-4 or 3+4 digits
-    'CN': r'^\d{6}$',  # China: 6 digits
+    'IN': re.compile(r'^\d{6}$'),  # India: 6 digits
+    'US': re.compile(r'^\d{5}(-\d{4})?$'),  # USA: 5 or 5+4 digits
+    'GB': re.compile(r'^[A-Z]{1,2}\d{1,2}[A-Z]?\s?\d[A-Z]{2}$'),  # UK
+    'CA': re.compile(r'^[A-Z]\d[A-Z]\s?\d[A-Z]\d$'),  # Canada
+    'AU': re.compile(r'^\d{4}$'),  # Australia: 4 digits
+    'DE': re.compile(r'^\d{5}$'),  # Germany: 5 digits
+    'FR': re.compile(r'^\d{5}$'),  # France: 5 digits
+    'JP': re.compile(r'^\d{3}-?\d{4}$'),  # Japan: 3-4 or 3+4 digits
+    'CN': re.compile(r'^\d{6}$'),  # China: 6 digits
+}
+
+
+def _digits(n: int):
+    """Validator for codes of exactly n digits."""
+    def check(code: str) -> bool:
+        return len(code) == n and code.isdecimal()
+    return check
+
+
+def _us_zip(code: str) -> bool:
+    """USA: 5 digits, optionally followed by -4 digits."""
+    if len(code) == 5:
+        return code.isdecimal()
+    return len(code) == 10 and code[5] == '-' and code[:5].isdecimal() and code[6:].isdecimal()
+
+
+def _jp_postal(code: str) -> bool:
+    """Japan: 3 digits, optional hyphen, 4 digits."""
+    if len(code) == 7:
+        return code.isdecimal()
+    return len(code) == 8 and code[3] == '-' and code[:3].isdecimal() and code[4:].isdecimal()
+
+
+# Per-country validators; all-digit formats use str checks instead of regex.
+# isdecimal() accepts the same characters as \d in the patterns above.
+POSTAL_VALIDATORS = {
+    'IN': _digits(6),
+    'US': _us_zip,
+    'GB': POSTAL_CODE_PATTERNS['GB'].match,
+    'CA': POSTAL_CODE_PATTERNS['CA'].match,
+    'AU': _digits(4),
+    'DE': _digits(5),
+    'FR': _digits(5),
+    'JP': _jp_postal,
+    'CN': _digits(6),
 }
 
 # Valid ISO-2 country codes (subset)
-VALID_COUNTRY_CODES = {
+VALID_COUNTRY_CODES = frozenset({
     'IN', 'US', 'GB', 'CA', 'AU', 'DE', 'FR', 'JP', 'CN',
     'BR', 'MX', 'IT', 'ES', 'NL', 'SE', 'NO', 'DK', 'FI',
     'PL', 'RO', 'CZ', 'HU', 'PT', 'GR', 'BE', 'AT', 'CH',
     'IE', 'NZ', 'SG', 'MY', 'TH', 'ID', 'PH', 'VN', 'KR',
     'TW', 'HK', 'AE', 'SA', 'IL', 'TR', 'EG', 'ZA', 'NG',
-}
+})
 
 
+@lru_cache(maxsize=4096)
 def validate_postal_code(postal_code: str, country: str) -> bool:
     """
     Validate postal code format for given country.
@@ -43,12 +81,12 @@ def validate_postal_code(postal_code: str, country: str) -> bool:
         return True  # Allow empty
     
     country = country.upper()
-    pattern = POSTAL_CODE_PATTERNS.get(country)
+    validator = POSTAL_VALIDATORS.get(country)
     
-    if not pattern:
+    if validator is None:
         return True  # Unknown country, allow any format
     
-    return bool(re.match(pattern, postal_code.strip()))
+    return bool(validator(postal_code.strip()))
 
 
 def validate_country_code(country: str) -> bool:
@@ -78,6 +116,10 @@ def validate_coordinates(lat: float, lng: float) -> bool:
     Returns:
         True if valid
     """
+    # Geocoder results are already numbers; only strings need parsing
+    if isinstance(lat, (int, float)) and isinstance(lng, (int, float)):
+        return -90 <= lat <= 90 and -180 <= lng <= 180
+    
     try:
         lat = float(lat)
         lng = float(lng)
@@ -96,6 +138,9 @@ def validate_confidence(confidence: float) -> bool:
     Returns:
         True if valid (0-1)
     """
+    if isinstance(confidence, (int, float)):
+        return 0 <= confidence <= 1
+    
     try:
         confidence = float(confidence)
         return 0 <= confidence <= 1
@@ -103,32 +148,40 @@ def validate_confidence(confidence: float) -> bool:
         return False
 
 
-def validate_address_record(record: Dict) -> tuple[bool, List[str]]:
+def _check_record(record: Dict, collect_errors: bool = True) -> List[str]:
     """
-    Validate complete address record.
+    Run the record checks behind validate_address_record.
     
     Args:
         record: Address record dict
+        collect_errors: If False, stop at the first failing check
     
     Returns:
-        Tuple of (is_valid, list_of_errors)
+        List of errors (at most one when not collecting)
     """
     errors = []
     
     # Required fields
     if not record.get('company_normalized'):
         errors.append("Missing company_normalized")
+        if not collect_errors:
+            return errors
     
     # Country validation
     country = record.get('country', '')
-    if country and not validate_country_code(country):
+    country_upper = country.upper() if country else ''
+    if country and country_upper not in VALID_COUNTRY_CODES:
         errors.append(f"Invalid country code: {country}")
+        if not collect_errors:
+            return errors
     
-    # Postal code validation
+    # Postal code validation (only countries with a known format can fail)
     postal_code = record.get('postal_code', '')
-    if postal_code and country:
-        if not validate_postal_code(postal_code, country):
+    if postal_code and country_upper in POSTAL_VALIDATORS:
+        if not validate_postal_code(postal_code, country_upper):
             errors.append(f"Invalid postal code format for {country}: {postal_code}")
+            if not collect_errors:
+                return errors
     
     # Coordinates validation
     lat = record.get('lat')
@@ -136,6 +189,8 @@ def validate_address_record(record: Dict) -> tuple[bool, List[str]]:
     if lat is not None and lng is not None:
         if not validate_coordinates(lat, lng):
             errors.append(f"Invalid coordinates: ({lat}, {lng})")
+            if not collect_errors:
+                return errors
     
     # Confidence validation
     confidence = record.get('confidence')
@@ -143,9 +198,31 @@ def validate_address_record(record: Dict) -> tuple[bool, List[str]]:
         if not validate_confidence(confidence):
             errors.append(f"Invalid confidence score: {confidence}")
     
+    return errors
+
+
+def validate_address_record(record: Dict) -> tuple[bool, List[str]]:
+    """
+    Validate complete address record.
+    
+    Args:
+        record: Address record dict
+    
+    Returns:
+        Tuple of (is_valid, list_of_errors)
+    """
+    errors = _check_record(record)
     return len(errors) == 0, errors
 
 
+# Fields every geocoding result should have, with their issue messages
+_REQUIRED_RESULT_FIELDS = ('city', 'country')
+_MISSING_ISSUES = {field: f"Missing {field}" for field in _REQUIRED_RESULT_FIELDS}
+# Starting score by number of missing fields (0.3 deducted per field, in the
+# same order as before so float results are unchanged)
+_SCORE_AFTER_MISSING = (1.0, 1.0 - 0.3, 1.0 - 0.3 - 0.3)
+
+
 def assess_result_quality(parsed_result: Dict) -> Dict:
     """
     Assess quality of geocoding result.
@@ -156,19 +233,15 @@ def assess_result_quality(parsed_result: Dict) -> Dict:
     Returns:
         Dict with quality assessment
     """
+    # Check for missing components
+    missing = [field for field in _REQUIRED_RESULT_FIELDS if not parsed_result.get(field)]
+    
     quality = {
-        'score': 1.0,
-        'issues': [],
+        'score': _SCORE_AFTER_MISSING[len(missing)],
+        'issues': [_MISSING_ISSUES[field] for field in missing],
         'warnings': [],
     }
     
-    # Check for missing components
-    required_fields = ['city', 'country']
-    for field in required_fields:
-        if not parsed_result.get(field):
-            quality['issues'].append(f"Missing {field}")
-            quality['score'] -= 0.3
-    
     # Check result types
     result_types = parsed_result.get('result_types', [])
     if 'political' in result_types or 'locality' in result_types:
@@ -215,9 +288,8 @@ def suggest_manual_review(record: Dict, threshold: float = 0.80) -> bool:
     if not record.get('city') or not record.get('country'):
         return True
     
-    # Validation errors
-    is_valid, errors = validate_address_record(record)
-    if not is_valid:
+    # Validation errors (any one is enough)
+    if _check_record(record, collect_errors=False):
         return True
     
     return False
@@ -17,13 +17,30 @@ except Exception as e:
     print(f"DEBUG: Failed to import streamlit: {e}")
 
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import tempfile
+import threading
 import json
-import base64
-import pandas as pd
-import google.generativeai as genai
-from gtts import gTTS
-from streamlit_mic_recorder import mic_recorder
+import hashlib
+import io
+import re
+
+# Concurrent lookups per batch run (lookups are network-bound)
+BATCH_CONCURRENCY = 16
+# Uploaded CSVs are processed this many rows at a time
+BATCH_CHUNK_ROWS = 1000
+# Result rows shown on the page; the download has all of them
+BATCH_PREVIEW_ROWS = 1000
+
+# Resy replies are 2-3 spoken sentences, so a fast model with a short output
+# cap keeps time-to-first-word low
+RESY_MODEL = "gemini-1.5-flash"
+RESY_GENERATION_CONFIG = {"max_output_tokens": 120, "temperature": 0.7}
+
+# Resy speech is synthesized sentence by sentence, several at a time
+TTS_WORKERS = 4
+MIN_SENTENCE_CHARS = 10
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
 
 # --- AI Assistant Persona ---
 ASSISTANT_SYSTEM_PROMPT = """
@@ -41,102 +58,110 @@ Keep your responses VERY CONCISE (max 2-3 sentences) because you are being conve
 Sound enthusiastic, premium, and helpful. Always greet the user warmly if it's the start of the conversation.
 """
 
+# --- Comprehensive Local Knowledge Base ---
+# Resy can guide users from start to finish, even without an AI API key.
+LOCAL_KB = [
+    # --- Greetings ---
+    (["hello", "hi", "hey", "good morning", "good evening"],
+     "Hello! 👋 I'm **Resy**, your intelligent guide for this Address Geocoding System. I can help you with setup, lookups, batch processing, and everything in between. What would you like to know?"),
+    (["who are you", "what are you", "your name"],
+     "I'm **Resy**, the AI-powered assistant built into this app. I know everything about how this system works — from getting your API keys to running batch geocoding jobs. Ask me anything!"),
+    (["what can you do", "help", "what do you know"],
+     "I can help you with: \n• **Setup** — API keys, Service Account JSON, Google Sheets\n• **Lookups** — Single company address search\n• **Batch Processing** — CSV upload and bulk geocoding\n• **Architecture** — How multi-tier caching saves you money\n• **AI Verification** — Agentic mode for web-based address confirmation\n• **Troubleshooting** — Common issues and fixes\n\nJust ask about any topic!"),
+
+    # --- Getting Started / Setup ---
+    (["get started", "start", "setup", "begin", "first step", "new user"],
+     "Welcome! Here's how to get started:\n\n**Step 1:** Go to the ⚙️ **Configuration** tab.\n**Step 2:** Enter your **Google Maps API Key** (required for geocoding).\n**Step 3:** Optionally add a **Google Sheet ID** and **Service Account JSON** for team-wide caching.\n**Step 4:** Optionally add a **Google AI API Key** for Agentic AI verification.\n\nOnce configured, head to 🔍 **Lookup** to search for your first company address!"),
+
+    # --- API Keys ---
+    (["api key", "google maps key", "maps key", "geocoding key"],
+     "The **Google Maps API Key** is essential for geocoding.\n\n**How to get one:**\n1. Go to [Google Cloud Console](https://console.cloud.google.com/)\n2. Create a project (or select an existing one)\n3. Go to **APIs & Services** → **Credentials**\n4. Click **Create Credentials** → **API Key**\n5. Enable the **Geocoding API** under **APIs & Services** → **Library**\n6. Copy the key and paste it in the ⚙️ Configuration tab.\n\n💡 Google gives you $200/month free credit (~40,000 requests)!"),
+    (["ai key", "ai api", "gemini key", "google ai"],
+     "The **Google AI API Key** powers two features:\n1. **Resy** (me!) — I use Gemini to answer complex questions\n2. **Agentic AI Verification** — The system searches the web to confirm addresses\n\n**How to get one:**\n1. Go to [Google AI Studio](https://aistudio.google.com/apikey)\n2. Click **Create API Key**\n3. Copy and paste it in the ⚙️ Configuration tab\n\nThis key is optional — the app works without it, but AI verification won't be available."),
+
+    # --- Service Account JSON ---
+    (["service account", "service json", "json file", "credentials file", "json credentials"],
+     "A **Service Account JSON** is a credentials file from Google Cloud that lets the app access your **Google Sheet** without you logging in.\n\n**How to get one:**\n1. Go to **Google Cloud Console** → **IAM & Admin** → **Service Accounts**\n2. Click **Create Service Account**, name it (e.g., 'geocoder-bot')\n3. Click on the account → **Keys** tab → **Add Key** → **Create new key** → **JSON**\n4. A `.json` file downloads — upload this in the ⚙️ Configuration tab\n5. **Important:** Share your Google Sheet with the email found in the JSON (`client_email` field)\n\nThis is optional but required if you want team-wide shared caching via Google Sheets."),
+
+    # --- Google Sheets ---
+    (["sheet", "google sheet", "sheet id", "spreadsheet"],
+     "The **Google Sheet ID** connects the app to a shared team spreadsheet for caching results.\n\n**How to find your Sheet ID:**\n1. Open your Google Sheet\n2. Look at the URL: `https://docs.google.com/spreadsheets/d/`**THIS_IS_YOUR_ID**`/edit`\n3. Copy that long string between `/d/` and `/edit`\n4. Paste it in the ⚙️ Configuration tab\n\n**Important:** Make sure the Service Account email has **Editor** access to this sheet!\n\n💡 Sharing one Sheet across departments means everyone benefits from cached lookups — saving API costs!"),
+
+    # --- Individual Lookup ---
+    (["lookup", "search", "find address", "single", "individual"],
+     "The 🔍 **Individual Lookup** page lets you find a company's standardized address.\n\n**How to use it:**\n1. Enter the **Company Name** (e.g., 'Tata Consultancy Services')\n2. Optionally provide a **Site Hint** (e.g., 'Mumbai' or 'India') for better accuracy\n3. Click **Search**\n\n**Results include:**\n• Standardized address (Street, City, State, PIN, Country)\n• Confidence score (0-100%)\n• Interactive map\n• Direct links to Google Maps and source verification\n• AI verification status (if enabled)"),
+
+    # --- Batch Processing ---
+    (["batch", "csv", "bulk", "upload", "multiple", "file"],
+     "The 📊 **Batch Processing** page handles hundreds of addresses at once.\n\n**How to use it:**\n1. Prepare a CSV file with a column named `company`\n2. Upload it in the Batch tab\n3. The system processes each company through the multi-tier cache\n4. Download the enriched CSV with all standardized addresses\n\n💡 The system uses caching, so repeat companies are resolved instantly without API calls!"),
+
+    # --- Multi-Tier Caching ---
+    (["cache", "caching", "tier", "multi-tier", "architecture", "how it works", "how does it work"],
+     "The app uses a **6-tier lookup architecture** to minimize API costs:\n\n1. ⚡ **Session Cache** (Instant) — Checks current session memory\n2. 💾 **SQLite Database** (Fast) — Persistent local cache\n3. 📊 **Google Sheets** (Team) — Shared team-wide registry\n4. 🤝 **Fuzzy Matching** — Finds similar names (e.g., 'Tata Services' → 'Tata Consultancy Services')\n5. 🌏 **Google Maps API** — Final fallback for new addresses\n6. 🤖 **Agentic AI** — Optional web verification\n\n💰 This can save up to **90% in API costs** because most lookups are resolved from cache!"),
+
+    # --- Agentic AI ---
+    (["agentic", "ai verification", "verify", "web search", "ai mode"],
+     "**Agentic AI Verification** is an optional feature that uses Gemini AI to search the web and confirm address details.\n\n**How it works:**\n1. After geocoding, the AI agent searches for the company online\n2. It finds the company's official website or directory listing\n3. It extracts the address from the source page\n4. It compares the found address with the geocoded result\n5. It provides a confidence score and the **source URL** where it found the information\n\n**To enable it:** Add a Google AI API Key in ⚙️ Configuration and check the 'Agentic AI' toggle.\n\n⚠️ This uses additional API calls, so it's best for high-value lookups where accuracy is critical."),
+
+    # --- Stats ---
+    (["stats", "statistics", "analytics", "dashboard", "cost"],
+     "The 📈 **Stats** page shows your geocoding analytics:\n\n• Total addresses processed\n• Cache hit rate (how many were resolved without API calls)\n• Estimated cost savings\n• Breakdown by source tier (Session, SQLite, Sheets, API)\n\n💡 A high cache hit rate means you're saving money!"),
+
+    # --- Review Queue ---
+    (["review", "queue", "manual", "flag", "low confidence"],
+     "The 🔍 **Review Queue** is for results that need manual verification.\n\n**When are results flagged?**\n• Confidence score below 0.8 (80%)\n• AI verification returned 'uncertain' or 'mismatch'\n• Fuzzy match with low similarity\n\nYou can review each flagged result, approve it, or manually correct the address."),
+
+    # --- Confidence Score ---
+    (["confidence", "score", "accuracy", "quality"],
+     "Every geocoded result gets a **Confidence Score** from 0 to 1 (0-100%):\n\n• **0.9-1.0** ✅ Excellent — High confidence, likely correct\n• **0.8-0.9** ✅ Good — Reliable for most purposes\n• **0.6-0.8** ⚠️ Review — May need manual verification\n• **Below 0.6** ❌ Low — Flagged for review queue\n\nThe score is based on the quality of the geocoding match and the AI verification (if enabled)."),
+
+    # --- Cost & Pricing ---
+    (["cost", "price", "pricing", "free", "money", "expensive", "cheap"],
+     "**Cost breakdown:**\n• **Google Maps Geocoding:** $5 per 1,000 requests ($200/month free credit ≈ 40,000 free requests)\n• **Google AI (Gemini):** Free tier available at [AI Studio](https://aistudio.google.com/)\n• **Google Sheets:** Free\n• **This app:** Free and open-source!\n\n💰 With multi-tier caching, you can save up to **90%** because repeat lookups use cached results instead of making new API calls."),
+
+    # --- Troubleshooting ---
+    (["error", "problem", "not working", "issue", "fix", "trouble", "bug"],
+     "Here are common issues and fixes:\n\n• **'Service not configured'** → Go to ⚙️ Configuration and add your Google Maps API Key\n• **'No results found'** → Try adding a site hint (e.g., 'India' or 'USA')\n• **Low confidence scores** → The company name may be ambiguous; add a location hint\n• **Sheet access error** → Make sure your Google Sheet is shared with the Service Account email\n• **AI not responding** → Check your Google AI API Key in Configuration\n\nStill stuck? Try describing your issue to me!"),
+
+    # --- Navigation ---
+    (["navigate", "page", "tab", "where", "find", "go to", "menu"],
+     "Here's a guide to all the pages:\n\n• 📖 **Instructions** — Full technical overview and architecture diagram\n• ⚙️ **Configuration** — Enter API keys and credentials\n• 🔍 **Lookup** — Search for a single company address\n• 📊 **Batch** — Upload CSV for bulk processing\n• 📈 **Stats** — View analytics and cost savings\n• 🔍 **Review Queue** — Manually verify flagged results\n\nUse the sidebar on the left to switch between pages!"),
+
+    # --- Data Format ---
+    (["format", "column", "csv format", "output", "fields", "data"],
+     "The system produces standardized address records with these fields:\n\n• **COMPANY NAME (NORMALIZED)** — Cleaned company name\n• **STREET ADDRESS1** — Street line\n• **CITY NAME** — City\n• **STATE NAME** — State/Province\n• **PIN CODE** — Postal/ZIP code\n• **COUNTRY NAME** — Country\n• **LAT / LNG** — GPS coordinates\n• **CONFIDENCE** — Match quality (0-1)\n• **AI VERIFICATION STATUS** — AI check result\n• **MAPS LINK** — Google Maps view\n• **AI SOURCE URL** — Website where address was found"),
+
+    # --- Security ---
+    (["security", "safe", "secure", "data privacy", "privacy"],
+     "Your data security is important:\n\n• API keys are stored only in your **browser session** — never saved to disk\n• The Service Account JSON is processed in memory only\n• All API calls use **HTTPS** encryption\n• Your Google Sheet is only accessible to accounts you explicitly share it with\n• No data is sent to third parties (except Google APIs that you configure)"),
+]
+
+# Every (keyword, response) pair, longest keyword first. Longer matches are
+# more specific; the stable sort keeps KB order among equal lengths.
+_KB_KEYWORDS = sorted(
+    ((keyword, response) for keywords, response in LOCAL_KB for keyword in keywords),
+    key=lambda pair: -len(pair[0]),
+)
+
+
+@st.cache_resource
+def _resy_model(api_key, model_name=RESY_MODEL):
+    """Gemini model for Resy, built once per API key."""
+    # Imported on first use; genai pulls in gRPC/protobuf, which slows cold starts
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model_name, generation_config=RESY_GENERATION_CONFIG)
+
+
 def get_resy_response(user_text):
     """Generate a response from Gemini for Resy, with comprehensive local knowledge."""
-    # --- Comprehensive Local Knowledge Base ---
-    # Resy can guide users from start to finish, even without an AI API key.
-    LOCAL_KB = [
-        # --- Greetings ---
-        (["hello", "hi", "hey", "good morning", "good evening"],
-         "Hello! 👋 I'm **Resy**, your intelligent guide for this Address Geocoding System. I can help you with setup, lookups, batch processing, and everything in between. What would you like to know?"),
-        (["who are you", "what are you", "your name"],
-         "I'm **Resy**, the AI-powered assistant built into this app. I know everything about how this system works — from getting your API keys to running batch geocoding jobs. Ask me anything!"),
-        (["what can you do", "help", "what do you know"],
-         "I can help you with: \n• **Setup** — API keys, Service Account JSON, Google Sheets\n• **Lookups** — Single company address search\n• **Batch Processing** — CSV upload and bulk geocoding\n• **Architecture** — How multi-tier caching saves you money\n• **AI Verification** — Agentic mode for web-based address confirmation\n• **Troubleshooting** — Common issues and fixes\n\nJust ask about any topic!"),
-
-        # --- Getting Started / Setup ---
-        (["get started", "start", "setup", "begin", "first step", "new user"],
-         "Welcome! Here's how to get started:\n\n**Step 1:** Go to the ⚙️ **Configuration** tab.\n**Step 2:** Enter your **Google Maps API Key** (required for geocoding).\n**Step 3:** Optionally add a **Google Sheet ID** and **Service Account JSON** for team-wide caching.\n**Step 4:** Optionally add a **Google AI API Key** for Agentic AI verification.\n\nOnce configured, head to 🔍 **Lookup** to search for your first company address!"),
-
-        # --- API Keys ---
-        (["api key", "google maps key", "maps key", "geocoding key"],
-         "The **Google Maps API Key** is essential for geocoding.\n\n**How to get one:**\n1. Go to [Google Cloud Console](https://console.cloud.google.com/)\n2. Create a project (or select an existing one)\n3. Go to **APIs & Services** → **Credentials**\n4. Click **Create Credentials** → **API Key**\n5. Enable the **Geocoding API** under **APIs & Services** → **Library**\n6. Copy the key and paste it in the ⚙️ Configuration tab.\n\n💡 Google gives you $200/month free credit (~40,000 requests)!"),
-        (["ai key", "ai api", "gemini key", "google ai"],
-         "The **Google AI API Key** powers two features:\n1. **Resy** (me!) — I use Gemini to answer complex questions\n2. **Agentic AI Verification** — The system searches the web to confirm addresses\n\n**How to get one:**\n1. Go to [Google AI Studio](https://aistudio.google.com/apikey)\n2. Click **Create API Key**\n3. Copy and paste it in the ⚙️ Configuration tab\n\nThis key is optional — the app works without it, but AI verification won't be available."),
-
-        # --- Service Account JSON ---
-        (["service account", "service json", "json file", "credentials file", "json credentials"],
-         "A **Service Account JSON** is a credentials file from Google Cloud that lets the app access your **Google Sheet** without you logging in.\n\n**How to get one:**\n1. Go to **Google Cloud Console** → **IAM & Admin** → **Service Accounts**\n2. Click **Create Service Account**, name it (e.g., 'geocoder-bot')\n3. Click on the account → **Keys** tab → **Add Key** → **Create new key** → **JSON**\n4. A `.json` file downloads — upload this in the ⚙️ Configuration tab\n5. **Important:** Share your Google Sheet with the email found in the JSON (`client_email` field)\n\nThis is optional but required if you want team-wide shared caching via Google Sheets."),
-
-        # --- Google Sheets ---
-        (["sheet", "google sheet", "sheet id", "spreadsheet"],
-         "The **Google Sheet ID** connects the app to a shared team spreadsheet for caching results.\n\n**How to find your Sheet ID:**\n1. Open your Google Sheet\n2. Look at the URL: `https://docs.google.com/spreadsheets/d/`**THIS_IS_YOUR_ID**`/edit`\n3. Copy that long string between `/d/` and `/edit`\n4. Paste it in the ⚙️ Configuration tab\n\n**Important:** Make sure the Service Account email has **Editor** access to this sheet!\n\n💡 Sharing one Sheet across departments means everyone benefits from cached lookups — saving API costs!"),
-
-        # --- Individual Lookup ---
-        (["lookup", "search", "find address", "single", "individual"],
-         "The 🔍 **Individual Lookup** page lets you find a company's standardized address.\n\n**How to use it:**\n1. Enter the **Company Name** (e.g., 'Tata Consultancy Services')\n2. Optionally provide a **Site Hint** (e.g., 'Mumbai' or 'India') for better accuracy\n3. Click **Search**\n\n**Results include:**\n• Standardized address (Street, City, State, PIN, Country)\n• Confidence score (0-100%)\n• Interactive map\n• Direct links to Google Maps and source verification\n• AI verification status (if enabled)"),
-
-        # --- Batch Processing ---
-        (["batch", "csv", "bulk", "upload", "multiple", "file"],
-         "The 📊 **Batch Processing** page handles hundreds of addresses at once.\n\n**How to use it:**\n1. Prepare a CSV file with a column named `company`\n2. Upload it in the Batch tab\n3. The system processes each company through the multi-tier cache\n4. Download the enriched CSV with all standardized addresses\n\n💡 The system uses caching, so repeat companies are resolved instantly without API calls!"),
-
-        # --- Multi-Tier Caching ---
-        (["cache", "caching", "tier", "multi-tier", "architecture", "how it works", "how does it work"],
-         "The app uses a **6-tier lookup architecture** to minimize API costs:\n\n1. ⚡ **Session Cache** (Instant) — Checks current session memory\n2. 💾 **SQLite Database** (Fast) — Persistent local cache\n3. 📊 **Google Sheets** (Team) — Shared team-wide registry\n4. 🤝 **Fuzzy Matching** — Finds similar names (e.g., 'Tata Services' → 'Tata Consultancy Services')\n5. 🌏 **Google Maps API** — Final fallback for new addresses\n6. 🤖 **Agentic AI** — Optional web verification\n\n💰 This can save up to **90% in API costs** because most lookups are resolved from cache!"),
-
-        # --- Agentic AI ---
-        (["agentic", "ai verification", "verify", "web search", "ai mode"],
-         "**Agentic AI Verification** is an optional feature that uses Gemini AI to search the web and confirm address details.\n\n**How it works:**\n1. After geocoding, the AI agent searches for the company online\n2. It finds the company's official website or directory listing\n3. It extracts the address from the source page\n4. It compares the found address with the geocoded result\n5. It provides a confidence score and the **source URL** where it found the information\n\n**To enable it:** Add a Google AI API Key in ⚙️ Configuration and check the 'Agentic AI' toggle.\n\n⚠️ This uses additional API calls, so it's best for high-value lookups where accuracy is critical."),
-
-        # --- Stats ---
-        (["stats", "statistics", "analytics", "dashboard", "cost"],
-         "The 📈 **Stats** page shows your geocoding analytics:\n\n• Total addresses processed\n• Cache hit rate (how many were resolved without API calls)\n• Estimated cost savings\n• Breakdown by source tier (Session, SQLite, Sheets, API)\n\n💡 A high cache hit rate means you're saving money!"),
-
-        # --- Review Queue ---
-        (["review", "queue", "manual", "flag", "low confidence"],
-         "The 🔍 **Review Queue** is for results that need manual verification.\n\n**When are results flagged?**\n• Confidence score below 0.8 (80%)\n• AI verification returned 'uncertain' or 'mismatch'\n• Fuzzy match with low similarity\n\nYou can review each flagged result, approve it, or manually correct the address."),
-
-        # --- Confidence Score ---
-        (["confidence", "score", "accuracy", "quality"],
-         "Every geocoded result gets a **Confidence Score** from 0 to 1 (0-100%):\n\n• **0.9-1.0** ✅ Excellent — High confidence, likely correct\n• **0.8-0.9** ✅ Good — Reliable for most purposes\n• **0.6-0.8** ⚠️ Review — May need manual verification\n• **Below 0.6** ❌ Low — Flagged for review queue\n\nThe score is based on the quality of the geocoding match and the AI verification (if enabled)."),
-
-        # --- Cost & Pricing ---
-        (["cost", "price", "pricing", "free", "money", "expensive", "cheap"],
-         "**Cost breakdown:**\n• **Google Maps Geocoding:** $5 per 1,000 requests ($200/month free credit ≈ 40,000 free requests)\n• **Google AI (Gemini):** Free tier available at [AI Studio](https://aistudio.google.com/)\n• **Google Sheets:** Free\n• **This app:** Free and open-source!\n\n💰 With multi-tier caching, you can save up to **90%** because repeat lookups use cached results instead of making new API calls."),
-
-        # --- Troubleshooting ---
-        (["error", "problem", "not working", "issue", "fix", "trouble", "bug"],
-         "Here are common issues and fixes:\n\n• **'Service not configured'** → Go to ⚙️ Configuration and add your Google Maps API Key\n• **'No results found'** → Try adding a site hint (e.g., 'India' or 'USA')\n• **Low confidence scores** → The company name may be ambiguous; add a location hint\n• **Sheet access error** → Make sure your Google Sheet is shared with the Service Account email\n• **AI not responding** → Check your Google AI API Key in Configuration\n\nStill stuck? Try describing your issue to me!"),
-
-        # --- Navigation ---
-        (["navigate", "page", "tab", "where", "find", "go to", "menu"],
-         "Here's a guide to all the pages:\n\n• 📖 **Instructions** — Full technical overview and architecture diagram\n• ⚙️ **Configuration** — Enter API keys and credentials\n• 🔍 **Lookup** — Search for a single company address\n• 📊 **Batch** — Upload CSV for bulk processing\n• 📈 **Stats** — View analytics and cost savings\n• 🔍 **Review Queue** — Manually verify flagged results\n\nUse the sidebar on the left to switch between pages!"),
-
-        # --- Data Format ---
-        (["format", "column", "csv format", "output", "fields", "data"],
-         "The system produces standardized address records with these fields:\n\n• **COMPANY NAME (NORMALIZED)** — Cleaned company name\n• **STREET ADDRESS1** — Street line\n• **CITY NAME** — City\n• **STATE NAME** — State/Province\n• **PIN CODE** — Postal/ZIP code\n• **COUNTRY NAME** — Country\n• **LAT / LNG** — GPS coordinates\n• **CONFIDENCE** — Match quality (0-1)\n• **AI VERIFICATION STATUS** — AI check result\n• **MAPS LINK** — Google Maps view\n• **AI SOURCE URL** — Website where address was found"),
-
-        # --- Security ---
-        (["security", "safe", "secure", "data privacy", "privacy"],
-         "Your data security is important:\n\n• API keys are stored only in your **browser session** — never saved to disk\n• The Service Account JSON is processed in memory only\n• All API calls use **HTTPS** encryption\n• Your Google Sheet is only accessible to accounts you explicitly share it with\n• No data is sent to third parties (except Google APIs that you configure)"),
-    ]
-
     user_text_lower = user_text.lower().strip()
 
-    # Check local knowledge base (supports multi-keyword matching)
-    best_match = None
-    best_score = 0
-    for keywords, response in LOCAL_KB:
-        for keyword in keywords:
-            if keyword in user_text_lower:
-                # Longer keyword matches are more specific, prioritize them
-                score = len(keyword)
-                if score > best_score:
-                    best_score = score
-                    best_match = response
-
-    if best_match:
-        return best_match
+    # Check local knowledge base; keywords are longest first, so the first
+    # hit is the most specific match
+    for keyword, response in _KB_KEYWORDS:
+        if keyword in user_text_lower:
+            return response
 
     # If not in local KB, try Gemini
     api_key = st.session_state.get('ai_key') or os.getenv('GOOGLE_AI_API_KEY')
@@ -147,28 +172,62 @@ def get_resy_response(user_text):
                 "For advanced questions, add a **Google AI API Key** in ⚙️ Configuration.")
 
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-1.5-pro')
+        model = _resy_model(api_key)
         response = model.generate_content(f"System: {ASSISTANT_SYSTEM_PROMPT}\nUser: {user_text}")
         return response.text
     except Exception as e:
         return f"I'm having trouble thinking right now. Error: {str(e)}"
 
 
+def _split_sentences(text):
+    """Split text into sentences, folding very short fragments into the next one."""
+    sentences = []
+    pending = ''
+    for piece in _SENTENCE_END_RE.split(text.strip()):
+        pending = f"{pending} {piece}" if pending else piece
+        if len(pending) >= MIN_SENTENCE_CHARS:
+            sentences.append(pending)
+            pending = ''
+    
+    if pending:
+        if sentences:
+            sentences[-1] = f"{sentences[-1]} {pending}"
+        else:
+            sentences.append(pending)
+    
+    return sentences
+
+
+def _synthesize(text):
+    """Synthesize one piece of speech with gTTS, returning mp3 bytes."""
+    from gtts import gTTS
+    buf = io.BytesIO()
+    gTTS(text=text, lang='en', slow=False).write_to_fp(buf)
+    return buf.getvalue()
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _tts_mp3(text):
+    """Synthesize speech for text, returning mp3 bytes (cached per text)."""
+    sentences = _split_sentences(text)
+    if len(sentences) <= 1:
+        return _synthesize(text)
+    
+    # gTTS fetches each chunk in its own request, one after another; running
+    # sentences concurrently overlaps those round-trips. MP3 frames concatenate
+    # cleanly, which is also how gTTS joins its own chunks.
+    with ThreadPoolExecutor(max_workers=TTS_WORKERS) as executor:
+        return b''.join(executor.map(_synthesize, sentences))
+
+
 def speak_text(text):
-    """Converts text to speech and returns an HTML audio tag for autoplay."""
+    """Converts text to speech, returning mp3 bytes (None on failure)."""
     try:
-        tts = gTTS(text=text, lang='en', slow=False)
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as fp:
-            tts.save(fp.name)
-            with open(fp.name, "rb") as audio_file:
-                audio_bytes = audio_file.read()
-            os.remove(fp.name)
-            
-            audio_base64 = base64.b64encode(audio_bytes).decode()
-            return f'<audio autoplay="true" src="data:audio/mp3;base64,{audio_base64}">'
+        # Resy's canned answers repeat, so each is only synthesized once
+        return _tts_mp3(text)
     except Exception as e:
-        return ""
+        print(f"⚠️  Text-to-speech failed: {e}")
+        return None
 
 
 # Page configuration
@@ -196,6 +255,17 @@ if 'use_agentic' not in st.session_state:
 if 'show_resy' not in st.session_state:
     st.session_state.show_resy = False
 
+@st.cache_resource
+def _written_files():
+    """
+    Hashes of runtime files last written, by path.
+    
+    The files are shared by every session in the process, and the script
+    re-runs on each interaction, so this lives in the resource cache.
+    """
+    return {}
+
+
 def apply_runtime_config():
     """Apply configuration from session state to environment."""
     if st.session_state.api_key:
@@ -205,20 +275,51 @@ def apply_runtime_config():
     
     if st.session_state.service_account_json:
         temp_file = Path(tempfile.gettempdir()) / "service_account.json"
-        with open(temp_file, 'w') as f:
-            f.write(st.session_state.service_account_json)
+        
+        # Only rewrite the file when its contents would change
+        digest = hashlib.sha256(st.session_state.service_account_json.encode()).hexdigest()
+        written = _written_files()
+        if written.get(temp_file) != digest or not temp_file.exists():
+            with open(temp_file, 'w') as f:
+                f.write(st.session_state.service_account_json)
+            written[temp_file] = digest
         os.environ['SERVICE_ACCOUNT_FILE'] = str(temp_file)
 
 
+def _warm_service(service):
+    """Authenticate with Sheets and load the registry ahead of the first lookup."""
+    try:
+        service.build_index()
+    except Exception as e:
+        print(f"⚠️  Service warm-up failed: {e}")
+
+
+@st.cache_resource
+def _lookup_service(api_key, sheet_id, service_account):
+    """
+    Lookup service for a set of credentials, shared across reruns and sessions.
+    
+    The arguments (service_account is the JSON text or file path) only key
+    the cache; the service reads them from config. The Sheets connection is
+    opened in the background so the first lookup doesn't wait for it.
+    """
+    from src.lookup_service import AddressLookupService
+    service = AddressLookupService()
+    threading.Thread(target=_warm_service, args=(service,), daemon=True).start()
+    return service
+
+
 def initialize_service():
     """Initialize the lookup service with current configuration."""
     try:
         apply_runtime_config()
-        from src.lookup_service import AddressLookupService
         from src import config as cfg
-        import importlib
-        importlib.reload(cfg)
-        st.session_state.service = AddressLookupService()
+        cfg.refresh_from_env()
+        st.session_state.service = _lookup_service(
+            cfg.GOOGLE_MAPS_API_KEY,
+            cfg.GOOGLE_SHEETS_ID,
+            st.session_state.service_account_json,
+        )
         st.session_state.configured = True
         return True
     except Exception as e:
@@ -281,6 +382,7 @@ def require_configuration():
     return True
 
 
+@st.fragment
 def main_page():
     """Main lookup page."""
     st.title("🔍 Individual Lookup")
@@ -335,32 +437,110 @@ def main_page():
                     st.info(f"AI Status: {record.get('AI VERIFICATION STATUS')}")
             
             if record.get('LAT') and record.get('LNG'):
-                st.map(pd.DataFrame({'lat': [float(record.get('LAT'))], 'lon': [float(record.get('LNG'))]}))
+                st.map({'lat': [float(record.get('LAT'))], 'lon': [float(record.get('LNG'))]})
         else:
             st.error("❌ No results found.")
 
 
+def _read_csv_chunks(content):
+    """Iterate over uploaded CSV bytes in frames of BATCH_CHUNK_ROWS rows."""
+    import pandas as pd
+    return pd.read_csv(io.BytesIO(content), chunksize=BATCH_CHUNK_ROWS)
+
+
+@st.cache_data(show_spinner=False)
+def _count_rows(content):
+    """Count rows in uploaded CSV bytes, cached so reruns don't re-parse the same upload."""
+    return sum(len(chunk) for chunk in _read_csv_chunks(content))
+
+
+@st.fragment
 def batch_page():
     """Batch processing page."""
+    # Only the batch page needs pandas; importing it here keeps cold starts light
+    import pandas as pd
+    
     st.title("📊 Batch Processing")
     if not require_configuration(): return
     
     uploaded_file = st.file_uploader("Upload CSV", type=['csv'])
     if uploaded_file:
-        df = pd.read_csv(uploaded_file)
-        st.write(f"Rows: {len(df)}")
+        content = uploaded_file.getvalue()
+        total = _count_rows(content)
+        st.write(f"Rows: {total}")
         if st.button("🚀 Process All"):
+            service = st.session_state.service
             progress = st.progress(0)
-            results = []
-            for i, row in df.iterrows():
-                company = str(row.get('company', '')).strip()
-                if not company: continue
-                record, source = st.session_state.service.lookup(company)
-                results.append({**dict(row), 'standardized_address': record.get('STREET ADDRESS1') if record else 'Not Found'})
-                progress.progress((i+1)/len(df))
-            st.dataframe(pd.DataFrame(results))
+            preview = st.empty()
+            
+            # Fetch the registry once and run lookups concurrently; Streamlit
+            # calls stay on this thread, and results keep the input order
+            index = service.build_index()
+            # Input rows handled so far; the bar is redrawn about 100 times per run
+            done = 0
+            tick = max(1, total // 100)
+            # Results as CSV text per chunk, plus the first rows for the page
+            csv_parts = []
+            result_rows = 0
+            shown = []
+            shown_rows = 0
+            
+            # Work through the file a chunk at a time so only one chunk of
+            # rows is held as a DataFrame at once
+            with ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY) as executor:
+                # A rerun or stop interrupts the loop; still write queued records,
+                # once lookups still running have finished and queued ones are dropped
+                try:
+                    for chunk in _read_csv_chunks(content):
+                        # Rows with a company name, selected column-wise
+                        if 'company' in chunk:
+                            companies = chunk['company'].fillna('').astype(str).str.strip()
+                        else:
+                            companies = pd.Series('', index=chunk.index)
+                        has_company = companies != ''
+                        batch = chunk[has_company]
+                        companies = companies[has_company].tolist()
+                        done += len(chunk) - len(companies)
+                        
+                        addresses = [None] * len(companies)
+                        futures = {
+                            executor.submit(service.lookup, company, index=index, defer_write=True): i
+                            for i, company in enumerate(companies)
+                        }
+                        for future in as_completed(futures):
+                            # One failed lookup marks its row instead of ending the run
+                            try:
+                                record, source = future.result()
+                            except Exception as e:
+                                print(f"✗ Batch lookup failed: {e}")
+                                addresses[futures[future]] = f"Error: {e}"
+                            else:
+                                addresses[futures[future]] = record.get('STREET ADDRESS1') if record else 'Not Found'
+                            done += 1
+                            if done % tick == 0:
+                                progress.progress(done / total)
+                        
+                        # Write this chunk's new records before moving on
+                        service.flush_pending()
+                        
+                        result = batch.assign(standardized_address=addresses)
+                        csv_parts.append(result.to_csv(index=False, header=not csv_parts))
+                        result_rows += len(result)
+                        if shown_rows < BATCH_PREVIEW_ROWS:
+                            shown.append(result.head(BATCH_PREVIEW_ROWS - shown_rows))
+                            shown_rows += len(shown[-1])
+                            preview.dataframe(pd.concat(shown))
+                finally:
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    service.flush_pending()
+            
+            progress.progress(1.0)
+            if shown_rows < result_rows:
+                st.caption(f"Showing the first {shown_rows} results; download for the full file.")
+            st.download_button("⬇️ Download results", ''.join(csv_parts), file_name="results.csv", mime="text/csv")
 
 
+@st.fragment
 def stats_page():
     """Statistics page."""
     st.title("📈 Statistics")
@@ -369,13 +549,14 @@ def stats_page():
     st.json(stats)
 
 
+@st.fragment
 def review_page():
     """Review queue page."""
     st.title("🔍 Review Queue")
     if not require_configuration(): return
     queue = st.session_state.service.get_review_queue()
     if queue:
-        st.dataframe(pd.DataFrame(queue))
+        st.dataframe(queue)
     else:
         st.success("✅ Queue is empty!")
 
@@ -442,14 +623,8 @@ def instructions_page():
     st.info("💡 **Pro Tip:** Sharing your Google Sheet ID across different departments prevents paying for the same address twice!")
 
 # --- Sidebar Integrated Resy Assistant ---
-def render_resy_assistant():
-    """Renders Resy as a floating-style chatbox at the top of the sidebar."""
-    # State for visibility
-    if 'show_resy' not in st.session_state:
-        st.session_state.show_resy = False
-
-    # Sidebar Chatbox Styles
-    st.markdown("""
+# Sidebar chatbox styles for Resy
+_RESY_CSS = """
         <style>
         /* Chatbox container in sidebar */
         .resy-sidebar-box {
@@ -474,9 +649,21 @@ def render_resy_assistant():
         /* Marker for internal targeting if needed */
         .resy-sb-marker { display: none; }
         </style>
-    """, unsafe_allow_html=True)
+    """
 
-    with st.sidebar.container():
+
+@st.fragment
+def render_resy_assistant():
+    """Renders Resy as a floating-style chatbox (call inside the sidebar)."""
+    # State for visibility
+    if 'show_resy' not in st.session_state:
+        st.session_state.show_resy = False
+
+    # Sidebar Chatbox Styles (re-emitted each run; Streamlit drops elements a rerun skips)
+    st.markdown(_RESY_CSS, unsafe_allow_html=True)
+
+    # Fragments can't write to st.sidebar directly; the caller places us there
+    with st.container():
         st.markdown('<div class="resy-sidebar-box">', unsafe_allow_html=True)
         st.subheader("🤖 Resy Guide")
         
@@ -489,6 +676,7 @@ def render_resy_assistant():
             st.markdown("---")
             
             # Voice Input using mic_recorder
+            from streamlit_mic_recorder import mic_recorder
             st.write("🎙️ **Voice Command**")
             audio = mic_recorder(
                 start_prompt="Start Recording",
@@ -505,25 +693,59 @@ def render_resy_assistant():
                 if voice_text:
                     st.success(f"I heard: {voice_text}")
             
-            # Text Input (Option)
-            user_input = st.text_input("Or type here:", key="resy_input_sb_v1", placeholder="How do I use Batch?", value=voice_text)
+            # Text Input (Option): a form only reruns on an explicit Send/Enter,
+            # not on every keystroke commit, and clears the box afterwards
+            with st.form("resy_form", clear_on_submit=True):
+                typed = st.text_input("Or type here:", key="resy_input_sb_v1", placeholder="How do I use Batch?")
+                submitted = st.form_submit_button("Send", use_container_width=True)
+            
+            # Ask once per submit or new transcription; every other rerun
+            # shows the previous answer without asking and speaking again
+            user_input = None
+            if submitted and typed:
+                user_input = typed
+            elif voice_text and voice_text != st.session_state.get('resy_voice_seen'):
+                user_input = voice_text
+                st.session_state.resy_voice_seen = voice_text
             
             if user_input:
                 with st.spinner("Thinking..."):
                     reply = get_resy_response(user_input)
-                    st.info(f"**Resy:** {reply}")
-                    
-                    audio_html = speak_text(reply)
-                    if audio_html:
-                        st.components.v1.html(audio_html, height=0)
-                        st.audio(base64.b64decode(audio_html.split(',')[1].replace('">', '')), format="audio/mp3")
+                    audio_bytes = speak_text(reply)
+                st.session_state.resy_last = (user_input, reply, audio_bytes)
+                autoplay = True
+            elif 'resy_last' in st.session_state:
+                _, reply, audio_bytes = st.session_state.resy_last
+                autoplay = False
+            else:
+                reply = None
+            
+            if reply:
+                st.info(f"**Resy:** {reply}")
+                if audio_bytes:
+                    # Served as a media file rather than an inline base64 data URI
+                    st.audio(audio_bytes, format="audio/mp3", autoplay=autoplay)
         st.markdown('</div>', unsafe_allow_html=True)
 
 # --- Main Flow ---
+# Credentials already in the environment (e.g. deployment secrets) start the
+# service on first load instead of waiting for the Configuration page
+if not st.session_state.configured:
+    from src import config as cfg
+    if cfg.validate_config()[0]:
+        st.session_state.service = _lookup_service(
+            cfg.GOOGLE_MAPS_API_KEY,
+            cfg.GOOGLE_SHEETS_ID,
+            cfg.SERVICE_ACCOUNT_FILE,
+        )
+        st.session_state.configured = True
+
 st.sidebar.title("🌍 Geocoding System")
 
 # NEW: Resy at the top of Sidebar
-render_resy_assistant()
+# Pages and Resy are fragments, so interacting with one reruns only that part
+with st.sidebar:
+    render_resy_assistant()
 
 if st.session_state.configured:
     st.sidebar.success("✅ Service Active")